@@ -12,4 +12,56 @@ class Settings(BaseSettings):
   FRONTEND_URL: str = "http://localhost:5173"
   GOOGLE_AUTH_URL: str = "https://accounts.google.com/o/oauth2/v2/auth"
   GOOGLE_TOKEN_URL: str = "https://oauth2.googleapis.com/token"
+  GOOGLE_JWKS_URL: str = "https://www.googleapis.com/oauth2/v3/certs"
+  GOOGLE_ISSUERS: list[str] = ["https://accounts.google.com", "accounts.google.com"]
+  HTTP_TIMEOUT_SECONDS: float = 10
+  HTTP_CONNECT_TIMEOUT_SECONDS: float = 5
+  HTTP_MAX_CONNECTIONS: int = 20
+  HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+  HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30
+  SUGGEST_CACHE_SIZE: int = 2048
+  SUGGEST_CACHE_TTL_SECONDS: float = 60
+  COUNT_STRATEGY: str = "cached"  # exact | cached | estimated
+  COUNT_CACHE_SIZE: int = 4096
+  COUNT_CACHE_TTL_SECONDS: float = 30
+  COUNT_ESTIMATE_THRESHOLD: int = 1000
+  CARD_CACHE_BACKEND: str = "memory"  # memory | redis
+  CARD_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+  CARD_CACHE_MAX_ENTRIES: int = 512
+  CARD_CACHE_TTL_SECONDS: float = 15
+  CARD_CACHE_STALE_SECONDS: float = 60
+  INTERNAL_API_TOKEN: str | None = None  # /internal and /metrics are disabled until set
+  RANKING_REFRESH_SECONDS: float = 60
+  RANKING_PRIOR_WEIGHT: float = 10
+  RANKING_DEFAULT_MEAN: float = 3.5
+  TRENDING_HALF_LIFE_HOURS: float = 24
+  TRENDING_WINDOW_DAYS: int = 7
+  TRENDING_VIEW_WEIGHT: float = 1
+  TRENDING_CLICK_WEIGHT: float = 3
+  TRENDING_REVIEW_WEIGHT: float = 10
+  COUNTER_FLUSH_SECONDS: float = 5
+  COUNTER_FLUSH_THRESHOLD: int = 1000
+  COUNTER_JOURNAL_PATH: str | None = None  # base path; each worker writes <path>.<pid>.journal
+  UNIQUE_VIEWERS_WINDOW_DAYS: int = 30
+  DETAIL_CACHE_MAX_ENTRIES: int = 2048
+  DETAIL_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+  DETAIL_CACHE_TTL_SECONDS: float = 300
+  OWNERSHIP_CACHE_SIZE: int = 4096
+  OWNERSHIP_CACHE_TTL_SECONDS: float = 30
+  AUTH_TOKEN_CACHE_SIZE: int = 10000
+  DB_ECHO: bool = False
+  DB_POOL_SIZE: int = 5
+  DB_MAX_OVERFLOW: int = 10
+  DB_POOL_TIMEOUT: float = 30
+  DB_POOL_PRE_PING: bool = True
+  DB_POOL_RECYCLE: int = 1800
+  DB_STATEMENT_CACHE_SIZE: int = 100
+  DB_PGBOUNCER: bool = False  # transaction-mode PgBouncer in front of Postgres
+  DATABASE_REPLICA_URLS: list[str] = []
+  DB_REPLICA_BALANCING: str = "round_robin"  # or "least_connections"
+  DB_REPLICA_MAX_LAG_SECONDS: float = 10
+  DB_REPLICA_CHECK_SECONDS: float = 5
+  DB_READ_AFTER_WRITE_SECONDS: float = 15
+  QUERY_BUDGET_STRICT: bool = False  # raise on budget breaches instead of logging (tests, CI)
+  QUERY_REPEAT_WARN_THRESHOLD: int = 5
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,100 @@
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.ext.asyncio import AsyncEngine
+import bisect
+import time
+
+# Upper bounds (seconds) of the checkout wait-time histogram buckets; the last bucket is +Inf
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class PoolMetrics:
+    """Counters for one engine's pool, fed by pool events and InstrumentedQueuePool."""
+
+    def __init__(self):
+        self.wait_counts = [0] * (len(WAIT_BUCKETS) + 1)
+        self.wait_sum = 0.0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_counts[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+        self.wait_sum += seconds
+
+    def snapshot(self, pool) -> dict:
+        snapshot = {
+            "pool": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "closes": self.closes,
+            "invalidations": self.invalidations,
+            "wait_seconds": {
+                "buckets": dict(zip([*map(str, WAIT_BUCKETS), "+Inf"], self.wait_counts)),
+                "sum": self.wait_sum,
+                "count": sum(self.wait_counts)
+            }
+        }
+        # NullPool (PgBouncer mode) keeps no connections, so there is nothing to size
+        if hasattr(pool, "checkedout"):
+            snapshot.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=pool.overflow()
+            )
+        return snapshot
+
+class _InstrumentedPool:
+    """Times how long each checkout waits for a connection (or, unpooled, to connect)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.observe_wait(time.perf_counter() - started)
+
+class InstrumentedQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+class InstrumentedNullPool(_InstrumentedPool, NullPool):
+    pass
+
+def instrument(engine: AsyncEngine) -> PoolMetrics:
+    """Attach churn counters to `engine`'s instrumented pool and return its metrics."""
+    pool = engine.sync_engine.pool
+    metrics = pool.metrics
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(pool, "close")
+    def _on_close(dbapi_connection, connection_record):
+        metrics.closes += 1
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+
+    return metrics
@@ -0,0 +1,57 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from contextvars import ContextVar, Token
+import time
+
+class QueryStats:
+    """SQL statements run on behalf of one request, filled in by engine events."""
+
+    __slots__ = ("statements", "seconds", "shapes")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+        # Statement text -> executions; compiled SQL keeps bind parameters out of the text
+        self.shapes: dict[str, int] = {}
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+def begin() -> tuple[QueryStats, Token]:
+    """Start collecting for the current request; pass the token to `end`."""
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+def end(token: Token) -> None:
+    _current.reset(token)
+
+def current() -> QueryStats | None:
+    return _current.get()
+
+def detach() -> None:
+    """Stop attributing statements to the request; for tasks spawned from one (tasks copy the context)."""
+    _current.set(None)
+
+def _record(statement: str, elapsed: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += elapsed
+        stats.shapes[statement] = stats.shapes.get(statement, 0) + 1
+
+# Listening on the Engine class covers the primary and every replica engine
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record(statement, time.perf_counter() - conn.info["query_started"].pop())
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; still count it
+    conn = exception_context.connection
+    started = conn.info.get("query_started") if conn is not None else None
+    if not started:
+        return
+    _record(exception_context.statement or "", time.perf_counter() - started.pop())
@@ -0,0 +1,128 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from utils.cache import TTLCache
+from typing import Optional
+import asyncio
+import hashlib
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds behind the primary. A standby with nothing left to replay is current however old its
+# last transaction is; a server that is not in recovery at all (a plain second Postgres) reports 0.
+_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+class Replica:
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.sessions = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        self.name = engine.url.render_as_string(hide_password=True)
+        # Out of rotation until the first lag check passes
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.in_use = 0
+        self.ejections = 0
+
+    def stats(self) -> dict:
+        return {
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "in_use": self.in_use,
+            "ejections": self.ejections
+        }
+
+class ReplicaSet:
+    """
+    Read replicas behind `get_read_db`. A background loop measures each replica's
+    replication lag and takes it out of rotation while it is unreachable or further
+    behind than `max_lag`; with no healthy replica, reads fall back to the primary.
+    """
+
+    def __init__(
+        self,
+        engines: list[AsyncEngine],
+        balancing: str = "round_robin",
+        max_lag: float = 10,
+        check_interval: float = 5,
+        read_after_write: float = 15
+    ):
+        if balancing not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown replica balancing {balancing!r}")
+        self.replicas = [Replica(engine) for engine in engines]
+        self.balancing = balancing
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.read_after_write = read_after_write
+        self._turn = itertools.count()
+        # Clients that committed a write recently, keyed by a digest of their session cookie
+        self._pinned = TTLCache(maxsize=10000, ttl=read_after_write)
+        self._task: Optional[asyncio.Task] = None
+
+    def pick(self, client: Optional[str] = None) -> Optional[Replica]:
+        """The replica to read from, or None when the read belongs on the primary."""
+        if client and self._pinned.get(_client_key(client)):
+            return None
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.balancing == "least_connections":
+            return min(healthy, key=lambda replica: replica.in_use)
+        return healthy[next(self._turn) % len(healthy)]
+
+    def pin_to_primary(self, client: str) -> None:
+        """Send `client`'s reads to the primary until its write has had time to replicate."""
+        if self.replicas and self.read_after_write > 0:
+            self._pinned.set(_client_key(client), True)
+
+    async def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    replica.lag_seconds = float(await conn.scalar(_LAG_QUERY))
+                healthy = replica.lag_seconds <= self.max_lag
+            except Exception:
+                logger.warning("Replica %s is unreachable", replica.name, exc_info=True)
+                replica.lag_seconds = None
+                healthy = False
+
+            if replica.healthy and not healthy:
+                replica.ejections += 1
+                logger.warning("Ejecting replica %s (lag %s s)", replica.name, replica.lag_seconds)
+            elif healthy and not replica.healthy:
+                logger.info("Replica %s back in rotation", replica.name)
+            replica.healthy = healthy
+
+    async def start(self) -> None:
+        if not self.replicas:
+            return
+        await self.check()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Replica health check failed")
+
+    def stats(self) -> dict:
+        return {replica.name: replica.stats() for replica in self.replicas}
+
+def _client_key(client: str) -> str:
+    return hashlib.sha256(client.encode()).hexdigest()
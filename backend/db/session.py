@@ -1,11 +1,48 @@
 from config.settings import settings
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from fastapi import Cookie
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from db.pool import InstrumentedQueuePool, InstrumentedNullPool, instrument
+from db.replicas import ReplicaSet
+from db.hooks import after_commit
+from contextlib import asynccontextmanager
+from uuid import uuid4
 
-engine = create_async_engine(
-  settings.DATABASE_URL,
-  future=True,
-  echo=True
-)
+def build_engine(url: str) -> AsyncEngine:
+  """
+  Engine with pool settings from config. With DB_PGBOUNCER the app relies on
+  PgBouncer (transaction mode) for pooling: no local pool and no named
+  server-side prepared statements, which don't survive connection reassignment.
+  """
+  if settings.DB_PGBOUNCER:
+    engine = create_async_engine(
+      url,
+      echo=settings.DB_ECHO,
+      poolclass=InstrumentedNullPool,
+      connect_args={
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__"
+      }
+    )
+  else:
+    engine = create_async_engine(
+      url,
+      echo=settings.DB_ECHO,
+      poolclass=InstrumentedQueuePool,
+      pool_size=settings.DB_POOL_SIZE,
+      max_overflow=settings.DB_MAX_OVERFLOW,
+      pool_timeout=settings.DB_POOL_TIMEOUT,
+      pool_pre_ping=settings.DB_POOL_PRE_PING,
+      pool_recycle=settings.DB_POOL_RECYCLE,
+      connect_args={
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+      }
+    )
+  instrument(engine)
+  return engine
+
+engine = build_engine(settings.DATABASE_URL)
 
 AsyncSessionLocal = async_sessionmaker(
   bind=engine,
@@ -13,9 +50,51 @@ AsyncSessionLocal = async_sessionmaker(
   expire_on_commit=False
 )
 
-async def get_db():
+replicas = ReplicaSet(
+  [build_engine(url) for url in settings.DATABASE_REPLICA_URLS],
+  balancing=settings.DB_REPLICA_BALANCING,
+  max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+  check_interval=settings.DB_REPLICA_CHECK_SECONDS,
+  read_after_write=settings.DB_READ_AFTER_WRITE_SECONDS
+)
+
+async def get_db(access_token: str = Cookie(None)):
   session = AsyncSessionLocal()
+  if access_token:
+    # Reads on replicas could miss this caller's own write for a while, so keep them on the primary
+    after_commit(session, lambda: replicas.pin_to_primary(access_token))
   try:
     yield session
   finally:
-    await session.close()
\ No newline at end of file
+    await session.close()
+
+@asynccontextmanager
+async def read_session(client: str | None = None):
+  """
+  Session for read-only work: a healthy replica when one is configured, else the
+  primary. Nothing may be written through it.
+  """
+  replica = replicas.pick(client)
+  if replica is None:
+    async with AsyncSessionLocal() as session:
+      yield session
+    return
+
+  replica.in_use += 1
+  try:
+    async with replica.sessions() as session:
+      yield session
+  finally:
+    replica.in_use -= 1
+
+async def get_read_db(access_token: str = Cookie(None)):
+  """get_db for public read-only endpoints; see read_session."""
+  async with read_session(access_token) as session:
+    yield session
+
+def pool_stats() -> dict:
+  stats = {"primary": engine.sync_engine.pool.metrics.snapshot(engine.sync_engine.pool)}
+  for replica in replicas.replicas:
+    pool = replica.engine.sync_engine.pool
+    stats[replica.name] = {**pool.metrics.snapshot(pool), **replica.stats()}
+  return stats
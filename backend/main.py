@@ -1,12 +1,37 @@
 from fastapi import FastAPI 
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from config.settings import settings
-from routers import auth, media, profile, review, rice, theme, users
+from routers import auth, internal, media, metrics, profile, review, rice, theme, users
+from services import ranking_service, http_client
+from services.counter_buffer import counter_buffer
+from services.request_metrics import RequestMetricsMiddleware
+from db.session import replicas
+import asyncio
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await http_client.start()
+    await replicas.start()
+    await counter_buffer.start()
+    background_tasks = []
+    if settings.RANKING_REFRESH_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(ranking_service.run_periodically()))
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await counter_buffer.stop()
+    await replicas.stop()
+    await http_client.stop()
 
 app = FastAPI(
     title="Rice Showcase API",
     description="API for sharing Linux customizations (ricing)",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -19,7 +44,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+app.add_middleware(RequestMetricsMiddleware)
 
 app.include_router(auth.router)
 app.include_router(profile.router)
@@ -28,6 +55,8 @@ app.include_router(review.router)
 app.include_router(rice.router)
 app.include_router(theme.router)
 app.include_router(users.router)
+app.include_router(internal.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 async def server_status():
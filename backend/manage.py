@@ -0,0 +1,60 @@
+"""
+Maintenance commands, run from the backend directory:
+
+    python manage.py reconcile-summaries [--rice-id ID]
+    python manage.py recompute-rankings [--full]
+    python manage.py rebuild-review-histograms [--rice-id ID]
+"""
+import argparse
+import asyncio
+from db.session import AsyncSessionLocal
+from services import rice_summary_service, ranking_service
+
+async def reconcile_summaries(args: argparse.Namespace) -> None:
+    async with AsyncSessionLocal() as db:
+        repaired = await rice_summary_service.reconcile_summaries(db, rice_id=args.rice_id)
+    print(f"Repaired summary columns on {repaired} rice(s)")
+
+async def recompute_rankings(args: argparse.Namespace) -> None:
+    async with AsyncSessionLocal() as db:
+        rescored = await ranking_service.recompute_rankings(db, full=args.full)
+    if rescored is None:
+        print("Another worker is already recomputing rankings")
+    else:
+        print(f"Rescored {rescored} rice(s)")
+
+async def rebuild_review_histograms(args: argparse.Namespace) -> None:
+    async with AsyncSessionLocal() as db:
+        repaired = await rice_summary_service.rebuild_rating_histograms(db, rice_id=args.rice_id)
+    print(f"Repaired rating histograms on {repaired} rice(s)")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rice backend maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = subparsers.add_parser(
+        "reconcile-summaries",
+        help="Recompute denormalized card columns on rices and repair drift"
+    )
+    reconcile.add_argument("--rice-id", type=int, default=None)
+    reconcile.set_defaults(handler=reconcile_summaries)
+
+    rankings = subparsers.add_parser(
+        "recompute-rankings",
+        help="Recompute rating and trending scores for rices that changed since the last run"
+    )
+    rankings.add_argument("--full", action="store_true", help="Rescore every rice")
+    rankings.set_defaults(handler=recompute_rankings)
+
+    histograms = subparsers.add_parser(
+        "rebuild-review-histograms",
+        help="Recount per-star review counts on rices from the reviews table"
+    )
+    histograms.add_argument("--rice-id", type=int, default=None)
+    histograms.set_defaults(handler=rebuild_review_histograms)
+
+    args = parser.parse_args()
+    asyncio.run(args.handler(args))
+
+if __name__ == "__main__":
+    main()
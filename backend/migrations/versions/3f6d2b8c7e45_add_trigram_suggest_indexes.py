@@ -0,0 +1,33 @@
+"""add trigram suggest indexes
+
+Revision ID: 3f6d2b8c7e45
+Revises: e91a6c3f5b27
+Create Date: 2026-10-18 12:40:09.615482
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6d2b8c7e45'
+down_revision: Union[str, Sequence[str], None] = 'e91a6c3f5b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_rices_name_trgm', 'rices', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_themes_tags_trgm', 'themes', ['tags'], unique=False, postgresql_using='gin', postgresql_ops={'tags': 'gin_trgm_ops'})
+    op.create_index('ix_profiles_username_trgm', 'profiles', ['username'], unique=False, postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_profiles_username_trgm', table_name='profiles', postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'})
+    op.drop_index('ix_themes_tags_trgm', table_name='themes', postgresql_using='gin', postgresql_ops={'tags': 'gin_trgm_ops'})
+    op.drop_index('ix_rices_name_trgm', table_name='rices', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
@@ -0,0 +1,38 @@
+"""add review helpful votes
+
+Revision ID: 4e9a2c7b5d61
+Revises: 8b3d6f1a7c24
+Create Date: 2026-10-18 18:15:52.340187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e9a2c7b5d61'
+down_revision: Union[str, Sequence[str], None] = '8b3d6f1a7c24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing helpful_count values predate vote tracking and are kept as-is
+    op.create_table('review_helpful_votes',
+    sa.Column('review_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('date_created', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['review_id'], ['reviews.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('review_id', 'user_id')
+    )
+    op.create_index(op.f('ix_review_helpful_votes_user_id'), 'review_helpful_votes', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_review_helpful_votes_user_id'), table_name='review_helpful_votes')
+    op.drop_table('review_helpful_votes')
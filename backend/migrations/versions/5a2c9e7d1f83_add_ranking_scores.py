@@ -0,0 +1,59 @@
+"""add ranking scores
+
+Revision ID: 5a2c9e7d1f83
+Revises: 3f6d2b8c7e45
+Create Date: 2026-10-18 14:02:33.170552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a2c9e7d1f83'
+down_revision: Union[str, Sequence[str], None] = '3f6d2b8c7e45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rices', sa.Column('rating_score', sa.Float(), server_default='0', nullable=False))
+    op.add_column('rices', sa.Column('trending_score', sa.Float(), server_default='0', nullable=False))
+    op.add_column('rices', sa.Column('ranking_dirty', sa.Boolean(), server_default='true', nullable=False))
+    op.create_index('ix_rices_live_rating_score_id', 'rices', ['rating_score', 'id'], unique=False, postgresql_where=sa.text('is_deleted = false'))
+    op.create_index('ix_rices_live_trending_score_id', 'rices', ['trending_score', 'id'], unique=False, postgresql_where=sa.text('is_deleted = false'))
+    op.create_index('ix_rices_ranking_dirty', 'rices', ['id'], unique=False, postgresql_where=sa.text('ranking_dirty'))
+
+    op.create_table('rice_activity',
+    sa.Column('rice_id', sa.Integer(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('views', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('dotfile_clicks', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('reviews', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['rice_id'], ['rices.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('rice_id', 'bucket_start')
+    )
+    op.create_index('ix_rice_activity_bucket', 'rice_activity', ['bucket_start'], unique=False)
+
+    op.create_table('ranking_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('global_mean_rating', sa.Float(), nullable=True),
+    sa.Column('last_run_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('ranking_state')
+    op.drop_index('ix_rice_activity_bucket', table_name='rice_activity')
+    op.drop_table('rice_activity')
+    op.drop_index('ix_rices_ranking_dirty', table_name='rices', postgresql_where=sa.text('ranking_dirty'))
+    op.drop_index('ix_rices_live_trending_score_id', table_name='rices', postgresql_where=sa.text('is_deleted = false'))
+    op.drop_index('ix_rices_live_rating_score_id', table_name='rices', postgresql_where=sa.text('is_deleted = false'))
+    op.drop_column('rices', 'ranking_dirty')
+    op.drop_column('rices', 'trending_score')
+    op.drop_column('rices', 'rating_score')
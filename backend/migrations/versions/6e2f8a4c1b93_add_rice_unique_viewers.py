@@ -0,0 +1,34 @@
+"""add rice unique viewers
+
+Revision ID: 6e2f8a4c1b93
+Revises: 9d4b1e6f2a58
+Create Date: 2026-10-18 16:02:11.537904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2f8a4c1b93'
+down_revision: Union[str, Sequence[str], None] = '9d4b1e6f2a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rice_unique_viewers',
+    sa.Column('rice_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('sketch', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['rice_id'], ['rices.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('rice_id', 'day')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rice_unique_viewers')
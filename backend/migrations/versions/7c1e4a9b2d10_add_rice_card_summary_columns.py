@@ -0,0 +1,49 @@
+"""add rice card summary columns
+
+Revision ID: 7c1e4a9b2d10
+Revises: 2a801f72b996
+Create Date: 2026-10-18 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4a9b2d10'
+down_revision: Union[str, Sequence[str], None] = '2a801f72b996'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rices', sa.Column('themes_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('rices', sa.Column('reviews_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('rices', sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('rices', sa.Column('preview_image_url', sa.String(length=500), nullable=True))
+
+    # Backfill from the source tables
+    op.execute("""
+        UPDATE rices SET
+            themes_count = (SELECT count(*) FROM themes WHERE themes.rice_id = rices.id),
+            reviews_count = (SELECT count(*) FROM reviews WHERE reviews.rice_id = rices.id),
+            rating_sum = (SELECT coalesce(sum(rating), 0) FROM reviews WHERE reviews.rice_id = rices.id),
+            preview_image_url = (
+                SELECT coalesce(theme_media.thumbnail_url, theme_media.url)
+                FROM theme_media JOIN themes ON themes.id = theme_media.theme_id
+                WHERE themes.rice_id = rices.id AND theme_media.media_type = 'IMAGE'
+                ORDER BY themes.display_order, themes.id, theme_media.display_order, theme_media.id
+                LIMIT 1
+            )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('rices', 'preview_image_url')
+    op.drop_column('rices', 'rating_sum')
+    op.drop_column('rices', 'reviews_count')
+    op.drop_column('rices', 'themes_count')
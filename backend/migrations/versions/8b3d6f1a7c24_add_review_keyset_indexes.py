@@ -0,0 +1,37 @@
+"""add review keyset indexes
+
+Revision ID: 8b3d6f1a7c24
+Revises: c2a7e5d94f16
+Create Date: 2026-10-18 17:41:09.664213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3d6f1a7c24'
+down_revision: Union[str, Sequence[str], None] = 'c2a7e5d94f16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (rice_id, date_created, id) covers everything ix_reviews_rice_date did
+    op.create_index('ix_reviews_rice_date_id', 'reviews', ['rice_id', 'date_created', 'id'], unique=False)
+    op.drop_index('ix_reviews_rice_date', table_name='reviews')
+    op.create_index('ix_reviews_rice_helpful_id', 'reviews', ['rice_id', 'helpful_count', 'id'], unique=False)
+    op.create_index('ix_reviews_rice_rating_id', 'reviews', ['rice_id', 'rating', 'id'], unique=False)
+    op.create_index('ix_reviews_user_date_id', 'reviews', ['user_id', 'date_created', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reviews_user_date_id', table_name='reviews')
+    op.drop_index('ix_reviews_rice_rating_id', table_name='reviews')
+    op.drop_index('ix_reviews_rice_helpful_id', table_name='reviews')
+    op.create_index('ix_reviews_rice_date', 'reviews', ['rice_id', 'date_created'], unique=False)
+    op.drop_index('ix_reviews_rice_date_id', table_name='reviews')
@@ -0,0 +1,28 @@
+"""add rice content version
+
+Revision ID: 9d4b1e6f2a58
+Revises: 5a2c9e7d1f83
+Create Date: 2026-10-18 15:20:48.091237
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b1e6f2a58'
+down_revision: Union[str, Sequence[str], None] = '5a2c9e7d1f83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rices', sa.Column('content_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('rices', 'content_version')
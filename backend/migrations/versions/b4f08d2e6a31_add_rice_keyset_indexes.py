@@ -0,0 +1,30 @@
+"""add rice keyset indexes
+
+Revision ID: b4f08d2e6a31
+Revises: 7c1e4a9b2d10
+Create Date: 2026-10-18 10:03:17.228904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f08d2e6a31'
+down_revision: Union[str, Sequence[str], None] = '7c1e4a9b2d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_rices_live_date_added_id', 'rices', ['date_added', 'id'], unique=False, postgresql_where=sa.text('is_deleted = false'))
+    op.create_index('ix_rices_live_views_id', 'rices', ['views', 'id'], unique=False, postgresql_where=sa.text('is_deleted = false'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rices_live_views_id', table_name='rices', postgresql_where=sa.text('is_deleted = false'))
+    op.drop_index('ix_rices_live_date_added_id', table_name='rices', postgresql_where=sa.text('is_deleted = false'))
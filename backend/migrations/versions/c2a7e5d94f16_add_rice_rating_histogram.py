@@ -0,0 +1,52 @@
+"""add rice rating histogram
+
+Revision ID: c2a7e5d94f16
+Revises: 6e2f8a4c1b93
+Create Date: 2026-10-18 17:04:36.218450
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2a7e5d94f16'
+down_revision: Union[str, Sequence[str], None] = '6e2f8a4c1b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for rating in range(1, 6):
+        op.add_column('rices', sa.Column(f'rating_{rating}_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill in one pass over reviews
+    op.execute("""
+        UPDATE rices SET
+            rating_1_count = h.c1,
+            rating_2_count = h.c2,
+            rating_3_count = h.c3,
+            rating_4_count = h.c4,
+            rating_5_count = h.c5
+        FROM (
+            SELECT
+                rice_id,
+                count(*) FILTER (WHERE rating = 1) AS c1,
+                count(*) FILTER (WHERE rating = 2) AS c2,
+                count(*) FILTER (WHERE rating = 3) AS c3,
+                count(*) FILTER (WHERE rating = 4) AS c4,
+                count(*) FILTER (WHERE rating = 5) AS c5
+            FROM reviews
+            GROUP BY rice_id
+        ) h
+        WHERE rices.id = h.rice_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for rating in range(5, 0, -1):
+        op.drop_column('rices', f'rating_{rating}_count')
@@ -0,0 +1,46 @@
+"""add rice search vector
+
+Revision ID: e91a6c3f5b27
+Revises: b4f08d2e6a31
+Create Date: 2026-10-18 11:26:52.874310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91a6c3f5b27'
+down_revision: Union[str, Sequence[str], None] = 'b4f08d2e6a31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rices', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Backfill; must match services.search_service.search_vector_expr
+    op.execute("""
+        UPDATE rices SET search_vector =
+            setweight(to_tsvector('simple'::regconfig, coalesce(rices.name, '')), 'A')
+            || (
+                SELECT
+                    setweight(to_tsvector('simple'::regconfig, coalesce(string_agg(themes.name, ' '), '')), 'B')
+                    || setweight(to_tsvector('simple'::regconfig, coalesce(string_agg(themes.tags, ' '), '')), 'B')
+                    || setweight(to_tsvector('simple'::regconfig, coalesce(string_agg(themes.description, ' '), '')), 'C')
+                FROM themes
+                WHERE themes.rice_id = rices.id
+            )
+    """)
+
+    op.create_index('ix_rices_search_vector', 'rices', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rices_search_vector', table_name='rices', postgresql_using='gin')
+    op.drop_column('rices', 'search_vector')
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, Boolean, Text, CheckConstraint, UniqueConstraint, Index, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, Boolean, Text, CheckConstraint, UniqueConstraint, Index, Enum, Float, Date, LargeBinary, cast, text
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import datetime
 from db.base import Base
 import enum
 
+RATING_VALUES = range(1, 6)
+
 class Rice(Base):
     __tablename__ = "rices"
 
@@ -16,35 +20,63 @@ class Rice(Base):
     date_added = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     date_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_deleted = Column(Boolean, default=False, nullable=False, index=True)
+
+    # Card summary, maintained on write by services.rice_summary_service
+    themes_count = Column(Integer, default=0, server_default="0", nullable=False)
+    reviews_count = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_sum = Column(Integer, default=0, server_default="0", nullable=False)
+    # Review histogram, one counter per star value
+    rating_1_count = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_2_count = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_3_count = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_4_count = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_5_count = Column(Integer, default=0, server_default="0", nullable=False)
+    preview_image_url = Column(String(500), nullable=True)
+    # Full-text document over rice name and theme names/tags/descriptions, maintained on write
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+    # Ranking scores, recomputed by services.ranking_service for rows flagged ranking_dirty
+    rating_score = Column(Float, default=0, server_default="0", nullable=False)
+    trending_score = Column(Float, default=0, server_default="0", nullable=False)
+    ranking_dirty = Column(Boolean, default=True, server_default="true", nullable=False)
+    # Bumped by every write that changes the rice detail payload; feeds ETags
+    content_version = Column(Integer, default=0, server_default="0", nullable=False)
     
     user = relationship("User", back_populates="rices")
     themes = relationship("Theme", back_populates="rice", cascade="all, delete-orphan")
     reviews = relationship("Review", back_populates="rice", cascade="all, delete-orphan")
 
-    @property
-    def themes_count(self) -> int:
-        return len(self.themes)
+    @hybrid_property
+    def avg_rating(self) -> float | None:
+        if not self.reviews_count:
+            return None
+        return self.rating_sum / self.reviews_count
 
-    @property
-    def reviews_count(self) -> int:
-        return len(self.reviews)
+    @avg_rating.expression
+    def avg_rating(cls):
+        return cast(cls.rating_sum, Float) / func.nullif(cls.reviews_count, 0)
+
+    @staticmethod
+    def rating_count_column(rating: int):
+        return getattr(Rice, f"rating_{rating}_count")
 
     @property
-    def avg_rating(self) -> float | None:
-        if not self.reviews:
-            return None
-        return sum(r.rating for r in self.reviews) / len(self.reviews)
+    def rating_distribution(self) -> dict[int, int]:
+        return {rating: getattr(self, f"rating_{rating}_count") for rating in RATING_VALUES}
 
     @property
     def preview_image(self) -> str | None:
-        if not self.themes:
-            return None
-        # Get first theme's first image (prefer thumbnail)
-        for theme in sorted(self.themes, key=lambda t: t.display_order):
-            for media in sorted(theme.media, key=lambda m: m.display_order):
-                if media.media_type.value == "IMAGE":
-                    return media.thumbnail_url or media.url
-        return None
+        return self.preview_image_url
+
+    __table_args__ = (
+        # Keyset pagination of the public listing: (sort key, id) over live rices
+        Index('ix_rices_live_date_added_id', 'date_added', 'id', postgresql_where=text('is_deleted = false')),
+        Index('ix_rices_live_views_id', 'views', 'id', postgresql_where=text('is_deleted = false')),
+        Index('ix_rices_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_rices_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_rices_live_rating_score_id', 'rating_score', 'id', postgresql_where=text('is_deleted = false')),
+        Index('ix_rices_live_trending_score_id', 'trending_score', 'id', postgresql_where=text('is_deleted = false')),
+        Index('ix_rices_ranking_dirty', 'id', postgresql_where=text('ranking_dirty')),
+    )
 
 class Theme(Base):
     __tablename__ = "themes"
@@ -63,6 +95,7 @@ class Theme(Base):
 
     __table_args__ = (
         Index('ix_themes_rice_order', 'rice_id', 'display_order'),  
+        Index('ix_themes_tags_trgm', 'tags', postgresql_using='gin', postgresql_ops={'tags': 'gin_trgm_ops'}),
     )
 
 class MediaType(enum.Enum):
@@ -103,9 +136,47 @@ class Review(Base):
     __table_args__ = (
         UniqueConstraint('rice_id', 'user_id', name='uq_rice_user_review'),
         CheckConstraint('rating >= 1 AND rating <= 5', name='check_rating_range'),
-        Index('ix_reviews_rice_date', 'rice_id', 'date_created'),
+        # Keyset pagination of review listings: (owner, sort key, id)
+        Index('ix_reviews_rice_date_id', 'rice_id', 'date_created', 'id'),
+        Index('ix_reviews_rice_helpful_id', 'rice_id', 'helpful_count', 'id'),
+        Index('ix_reviews_rice_rating_id', 'rice_id', 'rating', 'id'),
+        Index('ix_reviews_user_date_id', 'user_id', 'date_created', 'id'),
+    )
+
+class ReviewHelpfulVote(Base):
+    """One row per user who marked a review helpful; reviews.helpful_count counts these."""
+    __tablename__ = "review_helpful_votes"
+
+    review_id = Column(Integer, ForeignKey("reviews.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True)
+    date_created = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+class RiceActivity(Base):
+    """Hourly engagement buckets feeding the trending score."""
+    __tablename__ = "rice_activity"
+
+    rice_id = Column(Integer, ForeignKey("rices.id", ondelete="CASCADE"), primary_key=True)
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    views = Column(Integer, default=0, server_default="0", nullable=False)
+    dotfile_clicks = Column(Integer, default=0, server_default="0", nullable=False)
+    reviews = Column(Integer, default=0, server_default="0", nullable=False)
+
+    __table_args__ = (
+        Index('ix_rice_activity_bucket', 'bucket_start'),
     )
 
+class RiceUniqueViewers(Base):
+    """Daily HyperLogLog sketch of distinct viewer hashes per rice (see services/hll.py)."""
+    __tablename__ = "rice_unique_viewers"
 
+    rice_id = Column(Integer, ForeignKey("rices.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    sketch = Column(LargeBinary, nullable=False)
 
+class RankingState(Base):
+    """Single row of global inputs used by the last ranking run."""
+    __tablename__ = "ranking_state"
 
+    id = Column(Integer, primary_key=True)
+    global_mean_rating = Column(Float, nullable=True)
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,5 +1,5 @@
 from db.base import Base
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 class User(Base):
@@ -24,4 +24,8 @@ class Profile(Base):
     avatar_url = Column(String, nullable=True)
     github_url = Column(String, nullable=True)
 
-    user = relationship("User", back_populates="profiles")
\ No newline at end of file
+    user = relationship("User", back_populates="profiles")
+
+    __table_args__ = (
+        Index('ix_profiles_username_trgm', 'username', postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'}),
+    )
\ No newline at end of file
@@ -38,7 +38,7 @@ async def callback(
 
     tokens = await google_auth.exchange_code_for_tokens(code)
     id_token = tokens.get("id_token")
-    user_info = google_auth.decode_id_token(id_token)
+    user_info = await google_auth.decode_id_token(id_token)
 
     user = await user_service.get_user_by_google_id(db, user_info["sub"])
     if not user:
@@ -67,9 +67,11 @@ async def callback(
 
 @router.post("/logout")
 async def logout(
+    request: Request,
     response: Response,
     user_id: int = Depends(jwt_service.get_current_user)
 ):
+    jwt_service.evict_token(request.cookies["access_token"])
 
     response.delete_cookie(
         key="access_token",
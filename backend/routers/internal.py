@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Header
+from config.settings import settings
+from services import card_cache, detail_cache, ownership_service, jwt_service, count_service, suggest_service
+from services.counter_buffer import counter_buffer
+from db.session import pool_stats
+from typing import Optional
+import hmac
+
+def require_internal_token(x_internal_token: Optional[str] = Header(None)):
+    # Closed unless a token is configured
+    expected = settings.INTERNAL_API_TOKEN
+    if not expected or not x_internal_token or not hmac.compare_digest(x_internal_token.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Internal endpoint"
+        )
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    dependencies=[Depends(require_internal_token)],
+    include_in_schema=False
+)
+
+@router.get("/counters")
+async def counter_stats():
+    return counter_buffer.stats()
+
+@router.get("/cache-stats")
+async def cache_stats():
+    return {
+        "card_pages": card_cache.card_cache.stats(),
+        "rice_details": detail_cache.detail_cache.stats(),
+        "owners": ownership_service.cache_stats(),
+        "auth_tokens": jwt_service.token_cache_stats(),
+        "counts": count_service.cache_stats(),
+        "suggestions": suggest_service.cache_stats()
+    }
+
+@router.get("/db-pool")
+async def db_pool_stats():
+    return pool_stats()
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from db.session import get_db
+from db.session import get_db, get_read_db
 from services.jwt_service import get_current_user
+from services.ownership_service import require_theme_owner, require_media_owner
 from services import media_service
+from services.query_budget import query_budget
 from schemas.theme_media import ThemeMediaCreate, ThemeMediaUpdate, ThemeMediaOut
 from typing import List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 router = APIRouter(prefix="/media", tags=["media"])
 
@@ -14,7 +16,7 @@ async def add_media_to_theme(
     theme_id: int,
     media_data: ThemeMediaCreate,
     db: AsyncSession = Depends(get_db),
-    user_id: int = Depends(get_current_user)
+    user_id: int = Depends(require_theme_owner)
 ):
     media = await media_service.create_theme_media(
         db=db,
@@ -24,18 +26,38 @@ async def add_media_to_theme(
     await db.commit()
     return media
 
+class MediaBulkCreateRequest(BaseModel):
+    media: List[ThemeMediaCreate] = Field(..., min_length=1, max_length=100)
+
+@router.post("/theme/{theme_id}/bulk", response_model=List[ThemeMediaOut], status_code=status.HTTP_201_CREATED)
+async def add_media_to_theme_bulk(
+    theme_id: int,
+    bulk_data: MediaBulkCreateRequest,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(require_theme_owner)
+):
+    """Add several media files to a theme in one request"""
+    media = await media_service.create_theme_media_bulk(
+        db=db,
+        theme_id=theme_id,
+        media_list=bulk_data.media
+    )
+    await db.commit()
+    return media
+
 @router.get("/{media_id}", response_model=ThemeMediaOut)
 async def get_media(
     media_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     media = await media_service.get_media_by_id(db, media_id)
     return media
 
 @router.get("/theme/{theme_id}", response_model=List[ThemeMediaOut])
+@query_budget(statements=1)
 async def get_theme_media(
     theme_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     media_list = await media_service.get_media_by_theme(db, theme_id)
     return media_list
@@ -45,12 +67,11 @@ async def update_media(
     media_id: int,
     media_data: ThemeMediaUpdate,
     db: AsyncSession = Depends(get_db),
-    user_id: int = Depends(get_current_user)
+    user_id: int = Depends(require_media_owner)
 ):
     media = await media_service.update_theme_media(
         db=db,
         media_id=media_id,
-        user_id=user_id,
         media_data=media_data
     )
     return media
@@ -63,12 +84,14 @@ class MediaReorderRequest(BaseModel):
     media_order: List[MediaOrderItem]
 
 @router.post("/theme/{theme_id}/reorder", response_model=List[ThemeMediaOut])
+@query_budget(statements=4)
 async def reorder_theme_media(
     theme_id: int,
     reorder_data: MediaReorderRequest,
     db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user)
 ):
+    """Authorized inside reorder_media, in the same query as the membership check"""
     media_order = [item.dict() for item in reorder_data.media_order]
     
     updated_media = await media_service.reorder_media(
@@ -83,11 +106,10 @@ async def reorder_theme_media(
 async def delete_media(
     media_id: int,
     db: AsyncSession = Depends(get_db),
-    user_id: int = Depends(get_current_user)
+    user_id: int = Depends(require_media_owner)
 ):
     await media_service.delete_theme_media(
         db=db,
-        media_id=media_id,
-        user_id=user_id
+        media_id=media_id
     )
     return None
\ No newline at end of file
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends, Response
+from routers.internal import require_internal_token
+from services import metrics
+
+router = APIRouter(
+    tags=["internal"],
+    dependencies=[Depends(require_internal_token)],
+    include_in_schema=False
+)
+
+@router.get("/metrics")
+async def prometheus_metrics():
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -84,6 +84,8 @@ async def delete_account(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
+
+    jwt_service.evict_user(user_id)
     
     # Clear the authentication cookie
     response.delete_cookie(
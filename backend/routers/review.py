@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from db.session import get_db
+from db.session import get_db, get_read_db
 from services.jwt_service import get_current_user
-from services import review_service
+from services.ownership_service import require_review_owner
+from services import review_service, http_cache
+from services.query_budget import query_budget
 from schemas.review import ReviewCreate, ReviewUpdate, ReviewOut
 from typing import List
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    # Listings stay plain arrays; the cursor for the following page rides in a header
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
 @router.post("/rice/{rice_id}", response_model=ReviewOut, status_code=status.HTTP_201_CREATED)
 async def create_review(
     rice_id: int,
@@ -26,26 +33,39 @@ async def create_review(
 @router.get("/{review_id}", response_model=ReviewOut)
 async def get_review(
     review_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     review = await review_service.get_review_by_id(db, review_id)
     return review
 
 @router.get("/rice/{rice_id}", response_model=List[ReviewOut])
+@query_budget(statements=4)
 async def get_rice_reviews(
     rice_id: int,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     sort_by: str = Query("recent", regex="^(recent|helpful|rating_high|rating_low)$"),
-    db: AsyncSession = Depends(get_db)
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header; overrides skip"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    reviews = await review_service.get_reviews_by_rice(
+    stamp = await review_service.get_reviews_validator(db, rice_id)
+    etag = http_cache.weak_etag("reviews", rice_id, skip, limit, sort_by, cursor, *stamp)
+    policy = http_cache.cache_control(request)
+    if http_cache.etag_matches(request, etag):
+        return http_cache.not_modified(etag, policy)
+    http_cache.set_validators(response, etag, policy)
+
+    reviews, next_cursor = await review_service.get_reviews_by_rice(
         db=db,
         rice_id=rice_id,
         skip=skip,
         limit=limit,
-        sort_by=sort_by
+        sort_by=sort_by,
+        cursor=cursor
     )
+    set_next_cursor(response, next_cursor)
     return reviews
 
 @router.get("/rice/{rice_id}/me", response_model=ReviewOut)
@@ -70,23 +90,27 @@ async def get_my_review_for_rice(
 
 @router.get("/user/me", response_model=List[ReviewOut])
 async def get_my_reviews(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header; overrides skip"),
     db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user)
 ):
-    reviews = await review_service.get_reviews_by_user(
+    reviews, next_cursor = await review_service.get_reviews_by_user(
         db=db,
         user_id=user_id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
+    set_next_cursor(response, next_cursor)
     return reviews
 
 @router.get("/rice/{rice_id}/stats")
 async def get_review_stats(
     rice_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     stats = await review_service.get_review_stats(db, rice_id)
     return stats
@@ -96,33 +120,34 @@ async def update_review(
     review_id: int,
     review_data: ReviewUpdate,
     db: AsyncSession = Depends(get_db),
-    user_id: int = Depends(get_current_user)
+    user_id: int = Depends(require_review_owner)
 ):
     review = await review_service.update_review(
         db=db,
         review_id=review_id,
-        user_id=user_id,
         review_data=review_data
     )
     return review
 
 @router.post("/{review_id}/helpful", response_model=ReviewOut)
+@query_budget(statements=1)
 async def mark_review_helpful(
     review_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)
 ):
-    review = await review_service.mark_review_helpful(db, review_id)
+    """Idempotent: each user counts once, however often they click"""
+    review = await review_service.mark_review_helpful(db, review_id, user_id)
     return review
 
 @router.delete("/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_review(
     review_id: int,
     db: AsyncSession = Depends(get_db),
-    user_id: int = Depends(get_current_user)
+    user_id: int = Depends(require_review_owner)
 ):
     await review_service.delete_review(
         db=db,
-        review_id=review_id,
-        user_id=user_id
+        review_id=review_id
     )
     return None
\ No newline at end of file
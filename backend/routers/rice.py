@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from db.session import get_db
-from services.jwt_service import get_current_user
-from services import rice_service
+from db.session import get_db, get_read_db
+from services.jwt_service import get_current_user, get_optional_user
+from services.ownership_service import require_rice_owner
+from services import rice_service, suggest_service, card_cache, http_cache, unique_viewer_service
+from services.query_budget import query_budget
 from schemas.rice import (
     RiceCreate,
     RiceUpdate, 
@@ -10,13 +12,17 @@ from schemas.rice import (
     RiceOutSimple,
     RiceOutWithThemes,
     RicePaginationOut,
-    RiceCardPaginationOut
+    RiceCardPaginationOut,
+    RiceCardBatchOut,
+    RiceSuggestionOut
 )
 from typing import List, Dict, Any, Optional
 import math
 
 router = APIRouter(prefix="/rices", tags=["rices"])
 
+MAX_BATCH_IDS = 300
+
 @router.post("/", response_model=RiceOut, status_code=status.HTTP_201_CREATED)
 async def create_rice(
     rice_data: RiceCreate,
@@ -30,53 +36,116 @@ async def create_rice(
     )
     return rice
 
+@router.get("/suggest", response_model=List[RiceSuggestionOut])
+@query_budget(statements=1)
+async def suggest_rices(
+    q: str = Query(..., min_length=1, max_length=100, description="Typed prefix"),
+    limit: int = Query(8, ge=1, le=20),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Typeahead for the search bar - rice names, tags and usernames only"""
+    return await suggest_service.suggest(db, q, limit)
+
+@router.get("/batch", response_model=RiceCardBatchOut)
+@query_budget(statements=1)
+async def get_rice_batch(
+    request: Request,
+    ids: str = Query(..., description="Comma-separated rice ids"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Cards for several rices at once, in the given order; does not count views"""
+    try:
+        rice_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be comma-separated integers"
+        )
+    if len(rice_ids) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_IDS} ids per request"
+        )
+
+    cards, missing = await rice_service.get_rice_cards_by_ids(db, rice_ids)
+    body = RiceCardBatchOut(items=cards, missing=missing).model_dump_json().encode()
+    return http_cache.conditional_response(request, body, http_cache.PUBLIC_LISTING)
+
 @router.get("/{rice_id}", response_model=RiceOut)
+@query_budget(statements=2)
 async def get_rice(
     rice_id: int,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    viewer_id: int | None = Depends(get_optional_user)
 ):
-    # First increment views
-    await rice_service.increment_rice_views(db, rice_id)
+    # Revisits are answered from the validator alone; view counts may lag on a 304
+    validator, views, dotfile_clicks = await rice_service.get_rice_state(db, rice_id)
+    etag = http_cache.weak_etag("rice", rice_id, *validator)
+
+    # Validator lookup 404s for missing rices, so only real views are counted
+    rice_service.increment_rice_views(rice_id)
+    unique_viewer_service.record_view(rice_id, viewer_id, request)
+    policy = http_cache.cache_control(request)
+    if http_cache.etag_matches(request, etag):
+        return http_cache.not_modified(etag, policy)
     
     # Then fetch full details with poster info
-    rice = await rice_service.get_rice_with_details(db, rice_id)
+    rice = await rice_service.get_cached_rice_details(db, rice_id, validator, views, dotfile_clicks)
+    http_cache.set_validators(response, etag, policy)
     return rice
 
 @router.get("/", response_model=RiceCardPaginationOut)
+@query_budget(statements=3)
 async def get_all_rices(
+    request: Request,
     skip: int = Query(0, ge=0, description="Pagination offset"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
-    sort_by: str = Query("popular", regex="^(recent|popular|top_rated)$", description="Sort by"),
+    sort_by: str = Query("popular", regex="^(recent|popular|top_rated|trending|relevance)$", description="Sort by"),
     sort_order: str = Query("desc", regex="^(asc|desc)$", description="Sort order"),
     q: Optional[str] = Query(None, description="Search query"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor from next_cursor/prev_cursor; overrides skip")
 ):
     """Optimized endpoint for homepage rice cards - returns minimal data"""
-    cards, total = await rice_service.get_all_rice_cards(
-        db=db,
-        skip=skip,
-        limit=limit,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        q=q
-    )
-    
-    return RiceCardPaginationOut(
-        items=cards,
-        total=total,
-        page=(skip // limit) + 1,
-        limit=limit,
-        total_pages=math.ceil(total / limit) if total > 0 else 0
+    async def build_page(session: AsyncSession) -> tuple[bytes, list[int]]:
+        cards, total, total_is_exact, next_cursor, prev_cursor = await rice_service.get_all_rice_cards(
+            db=session,
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            q=q,
+            cursor=cursor
+        )
+        page = RiceCardPaginationOut(
+            items=cards,
+            total=total,
+            total_is_exact=total_is_exact,
+            page=None if cursor else (skip // limit) + 1,
+            limit=limit,
+            total_pages=math.ceil(total / limit) if total > 0 else 0,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor
+        )
+        return page.model_dump_json().encode(), [card["id"] for card in cards]
+
+    body = await card_cache.card_cache.get_or_build(
+        card_cache.page_key(sort_by, sort_order, q, skip, limit, cursor),
+        card_cache.page_tags(sort_by, q),
+        build_page
     )
+    return http_cache.conditional_response(request, body, http_cache.PUBLIC_LISTING)
 
 @router.get("/user/{user_id}", response_model=RicePaginationOut)
+@query_budget(statements=3)
 async def get_user_rices(
     user_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    rices, total = await rice_service.get_rice_by_user(
+    rices, total, total_is_exact = await rice_service.get_rice_by_user(
         db=db,
         user_id=user_id,
         skip=skip,
@@ -85,6 +154,7 @@ async def get_user_rices(
     return RicePaginationOut(
         items=rices,
         total=total,
+        total_is_exact=total_is_exact,
         page=(skip // limit) + 1,
         limit=limit,
         total_pages=math.ceil(total / limit) if total > 0 else 1
@@ -98,7 +168,7 @@ async def get_my_rices(
     db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user)
 ):
-    rices, total = await rice_service.get_rice_by_user(
+    rices, total, total_is_exact = await rice_service.get_rice_by_user(
         db=db,
         user_id=user_id,
         skip=skip,
@@ -108,6 +178,7 @@ async def get_my_rices(
     return RicePaginationOut(
         items=rices,
         total=total,
+        total_is_exact=total_is_exact,
         page=(skip // limit) + 1,
         limit=limit,
         total_pages=math.ceil(total / limit) if total > 0 else 0
@@ -115,9 +186,10 @@ async def get_my_rices(
 
 
 @router.get("/{rice_id}/stats")
+@query_budget(statements=2)
 async def get_rice_stats(
     rice_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     stats = await rice_service.get_rice_stats(db, rice_id)
     return stats
@@ -127,12 +199,11 @@ async def update_rice(
     rice_id: int,
     rice_data: RiceUpdate,
     db: AsyncSession = Depends(get_db),
-    user_id: int = Depends(get_current_user)
+    user_id: int = Depends(require_rice_owner)
 ):
     rice = await rice_service.update_rice(
         db=db,
         rice_id=rice_id,
-        user_id=user_id,
         rice_data=rice_data
     )
     return rice
@@ -142,12 +213,11 @@ async def delete_rice(
     rice_id: int,
     soft_delete: bool = Query(True, description="Soft delete (recoverable) or hard delete"),
     db: AsyncSession = Depends(get_db),
-    user_id: int = Depends(get_current_user)
+    user_id: int = Depends(require_rice_owner)
 ):
     await rice_service.delete_rice(
         db=db,
         rice_id=rice_id,
-        user_id=user_id,
         soft_delete=soft_delete
     )
     return None
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from db.session import get_db
+from db.session import get_db, get_read_db
 from services.jwt_service import get_current_user
-from services import theme_service
+from services.ownership_service import require_rice_owner, require_theme_owner
+from services import theme_service, http_cache
+from services.query_budget import query_budget
 from schemas.theme import ThemeCreate, ThemeUpdate, ThemeOut, ThemeOutSimple
 from typing import List
+from pydantic import BaseModel
 
 router = APIRouter(prefix="/themes", tags=["themes"])
 
@@ -13,7 +16,7 @@ async def add_theme_to_rice(
     rice_id: int,
     theme_data: ThemeCreate,
     db: AsyncSession = Depends(get_db),
-    user_id: int = Depends(get_current_user)
+    user_id: int = Depends(require_rice_owner)
 ):
     theme = await theme_service.create_theme(
         db=db,
@@ -24,18 +27,30 @@ async def add_theme_to_rice(
     return theme
 
 @router.get("/{theme_id}", response_model=ThemeOut)
+@query_budget(statements=2)
 async def get_theme(
     theme_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     theme = await theme_service.get_theme_by_id(db, theme_id)
     return theme
 
 @router.get("/rice/{rice_id}", response_model=List[ThemeOut])
+@query_budget(statements=3)
 async def get_themes_for_rice(
     rice_id: int,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
 ):
+    version = await theme_service.get_themes_validator(db, rice_id)
+    if version is not None:
+        etag = http_cache.weak_etag("themes", rice_id, version)
+        policy = http_cache.cache_control(request)
+        if http_cache.etag_matches(request, etag):
+            return http_cache.not_modified(etag, policy)
+        http_cache.set_validators(response, etag, policy)
+
     themes = await theme_service.get_themes_by_rice(db, rice_id)
     return themes
 
@@ -44,25 +59,49 @@ async def update_theme(
     theme_id: int,
     theme_data: ThemeUpdate,
     db: AsyncSession = Depends(get_db),
-    user_id: int = Depends(get_current_user)
+    user_id: int = Depends(require_theme_owner)
 ):
     theme = await theme_service.update_theme(
         db=db,
         theme_id=theme_id,
-        user_id=user_id,
         theme_data=theme_data
     )
     return theme
 
+class ThemeOrderItem(BaseModel):
+    theme_id: int
+    display_order: int
+
+class ThemeReorderRequest(BaseModel):
+    theme_order: List[ThemeOrderItem]
+
+@router.post("/rice/{rice_id}/reorder", response_model=List[ThemeOut])
+@query_budget(statements=5)
+async def reorder_rice_themes(
+    rice_id: int,
+    reorder_data: ThemeReorderRequest,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+):
+    """Authorized inside reorder_themes, in the same query as the membership check"""
+    theme_order = [item.model_dump() for item in reorder_data.theme_order]
+
+    themes = await theme_service.reorder_themes(
+        db=db,
+        rice_id=rice_id,
+        user_id=user_id,
+        theme_order=theme_order
+    )
+    return themes
+
 @router.delete("/{theme_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_theme(
     theme_id: int,
     db: AsyncSession = Depends(get_db),
-    user_id: int = Depends(get_current_user)
+    user_id: int = Depends(require_theme_owner)
 ):
     await theme_service.delete_theme(
         db=db,
-        theme_id=theme_id,
-        user_id=user_id
+        theme_id=theme_id
     )
     return None
\ No newline at end of file
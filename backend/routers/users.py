@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from services import user_service
-from db.session import get_db
+from services import user_service, http_cache
+from db.session import get_read_db
 from schemas.user import PublicProfileOut
 from typing import Optional
 
@@ -10,7 +10,8 @@ router = APIRouter(prefix="/users", tags=["users"])
 @router.get("/{user_id}", response_model=PublicProfileOut)
 async def get_user_by_id(
     user_id: int,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
 
     user, profile = await user_service.get_user_info(db, user_id)
@@ -21,7 +22,7 @@ async def get_user_by_id(
             detail="User not found"
         )
     
-    return PublicProfileOut(
+    public_profile = PublicProfileOut(
         id=user.id,
         username=profile.username if profile else f"user_{user.id}",
         name=user.name,
@@ -29,4 +30,6 @@ async def get_user_by_id(
         avatar_url=profile.avatar_url if profile else None,
         github_url=profile.github_url if profile else None,
         picture=user.picture
-    )
\ No newline at end of file
+    )
+    # The profile row is the whole payload, so hashing the body is the cheapest validator
+    return http_cache.conditional_response(request, public_profile.model_dump_json().encode())
\ No newline at end of file
@@ -74,13 +74,27 @@ class RiceCardPaginationOut(BaseModel):
   """Optimized pagination for homepage cards"""
   items: list[RiceCardOut]
   total: int
-  page: int
+  total_is_exact: bool = True
+  page: int | None = None
   limit: int
   total_pages: int
+  next_cursor: str | None = None
+  prev_cursor: str | None = None
+
+class RiceCardBatchOut(BaseModel):
+  """Cards in the requested order; ids that don't exist or are deleted are listed in `missing`"""
+  items: list[RiceCardOut]
+  missing: list[int] = []
 
 class RicePaginationOut(BaseModel):
   items: list[RiceOutSimple]
   total: int
+  total_is_exact: bool = True
   page: int
   limit: int
   total_pages: int
+
+class RiceSuggestionOut(BaseModel):
+  kind: str
+  id: int | None = None
+  label: str
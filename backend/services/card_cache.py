@@ -0,0 +1,272 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterable
+from config.settings import settings
+from db.hooks import after_commit
+from db.session import AsyncSessionLocal
+from db import query_stats
+import asyncio
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Tags attached to every cached homepage page. Writes invalidate by tag:
+#   "all"            - membership of any listing may have changed (rice created/deleted)
+#   "sort:<sort_by>" - ordering of that sort may have changed
+#   "search"         - pages for a `q`, whose matches depend on names and tags
+#   "rice:<id>"      - pages showing that rice's card
+TAG_ALL = "all"
+TAG_SEARCH = "search"
+
+def sort_tag(sort_by: str) -> str:
+    return f"sort:{sort_by}"
+
+def rice_tag(rice_id: int) -> str:
+    return f"rice:{rice_id}"
+
+class MemoryBackend:
+    """Per-process LRU with a tag -> keys index for invalidation."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes, tuple[str, ...]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at <= time.time():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str], ttl: float) -> None:
+        self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = (time.time() + ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+    def entry_count(self) -> int | None:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+class RedisBackend:
+    """
+    Shared cache over the Redis protocol (Redis, Valkey, or a local stand-in).
+    Tags are Redis sets of entry keys.
+    """
+
+    def __init__(self, url: str, prefix: str = "rice:cards:"):
+        # Only needed when this backend is configured
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self._prefix = prefix
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(self._prefix + key)
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str], ttl: float) -> None:
+        ttl_ms = max(int(ttl * 1000), 1)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.set(self._prefix + key, value, px=ttl_ms)
+            for tag in tags:
+                tag_key = f"{self._prefix}tag:{tag}"
+                pipe.sadd(tag_key, key)
+                pipe.pexpire(tag_key, ttl_ms)
+            await pipe.execute()
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            tag_key = f"{self._prefix}tag:{tag}"
+            keys = await self._redis.smembers(tag_key)
+            await self._redis.delete(tag_key, *(self._prefix + key.decode() for key in keys))
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter(match=f"{self._prefix}*"):
+            await self._redis.delete(key)
+
+    def entry_count(self) -> int | None:
+        # Entries live in Redis and expire there; counting them would mean a SCAN per stats call
+        return None
+
+class CardPageCache:
+    """
+    Serialized RiceCardPaginationOut pages with TTL and stale-while-revalidate:
+    a page past its TTL but inside the stale window is served as-is while one
+    background task rebuilds it.
+    """
+
+    def __init__(self, backend, ttl: float, stale_ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+        # Bumped on every invalidation so builds that raced a write don't store old data
+        self._epoch = 0
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get_or_build(
+        self,
+        key: str,
+        tags: Iterable[str],
+        build: Callable[[AsyncSession], Awaitable[tuple[bytes, list[int]]]]
+    ) -> bytes:
+        """
+        `build(db)` returns (body, rice ids on the page). Pages are built on the
+        primary, never a replica: one build is served to every client until its
+        TTL, so it must not predate a write whose invalidation just emptied it.
+        """
+        tags = tuple(tags)
+        try:
+            raw = await self.backend.get(key)
+        except Exception:
+            logger.exception("Card cache read failed")
+            self.errors += 1
+            raw = None
+
+        if raw is not None:
+            fresh_until, body = _unpack(raw)
+            if fresh_until > time.time():
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._refresh_in_background(key, tags, build)
+            return body
+
+        self.misses += 1
+        epoch = self._epoch
+        async with AsyncSessionLocal() as db:
+            body, rice_ids = await build(db)
+        await self._store(key, tags, body, rice_ids, epoch)
+        return body
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        self._epoch += 1
+        self.invalidations += 1
+        self._spawn(self._invalidate(tuple(tags)))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": self.backend.entry_count(),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else None,
+            "invalidations": self.invalidations,
+            "errors": self.errors
+        }
+
+    async def _store(self, key: str, tags: tuple[str, ...], body: bytes, rice_ids: list[int], epoch: int) -> None:
+        if epoch != self._epoch:
+            return
+        all_tags = tags + tuple(rice_tag(rice_id) for rice_id in rice_ids)
+        try:
+            await self.backend.set(key, _pack(time.time() + self.ttl, body), all_tags, self.ttl + self.stale_ttl)
+        except Exception:
+            logger.exception("Card cache write failed")
+            self.errors += 1
+
+    async def _invalidate(self, tags: tuple[str, ...]) -> None:
+        try:
+            await self.backend.invalidate_tags(tags)
+        except Exception:
+            logger.exception("Card cache invalidation failed")
+            self.errors += 1
+
+    def _refresh_in_background(self, key: str, tags: tuple[str, ...], build) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        self._spawn(self._refresh(key, tags, build))
+
+    async def _refresh(self, key: str, tags: tuple[str, ...], build) -> None:
+        # Spawned from a request, but its queries aren't that request's
+        query_stats.detach()
+        try:
+            epoch = self._epoch
+            async with AsyncSessionLocal() as db:
+                body, rice_ids = await build(db)
+            await self._store(key, tags, body, rice_ids, epoch)
+        except Exception:
+            logger.exception("Card cache background refresh failed")
+            self.errors += 1
+        finally:
+            self._refreshing.discard(key)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+def _pack(fresh_until: float, body: bytes) -> bytes:
+    return f"{fresh_until:.3f}\n".encode() + body
+
+def _unpack(raw: bytes) -> tuple[float, bytes]:
+    header, _, body = raw.partition(b"\n")
+    return float(header), body
+
+def _build_backend():
+    if settings.CARD_CACHE_BACKEND == "redis":
+        return RedisBackend(settings.CARD_CACHE_REDIS_URL)
+    return MemoryBackend(settings.CARD_CACHE_MAX_ENTRIES)
+
+card_cache = CardPageCache(
+    _build_backend(),
+    ttl=settings.CARD_CACHE_TTL_SECONDS,
+    stale_ttl=settings.CARD_CACHE_STALE_SECONDS
+)
+
+def page_key(
+    sort_by: str,
+    sort_order: str,
+    q: str | None,
+    skip: int,
+    limit: int,
+    cursor: str | None
+) -> str:
+    return json.dumps([sort_by, sort_order, (q or "").strip().lower(), skip, limit, cursor], separators=(",", ":"))
+
+def page_tags(sort_by: str, q: str | None) -> list[str]:
+    tags = [TAG_ALL, sort_tag(sort_by)]
+    if q:
+        tags.append(TAG_SEARCH)
+    return tags
+
+def invalidate_on_commit(db: AsyncSession, *tags: str) -> None:
+    """Schedule invalidation of cached pages carrying any of `tags` once `db` commits."""
+    after_commit(db, lambda: card_cache.invalidate(tags))
@@ -0,0 +1,96 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, text
+from sqlalchemy.sql import Select
+from typing import Hashable
+from utils.cache import TTLCache
+from db.hooks import after_commit
+from config.settings import settings
+import json
+
+# Count strategies for paginated listings:
+#   exact     - SELECT count(*) on every request
+#   cached    - exact counts memoized per (listing, filters) key, dropped on writes that change
+#               which rices a filter matches; reported inexact since other workers lag by the TTL
+#   estimated - planner estimates when the result is large, exact below the threshold
+COUNT_STRATEGIES = ("exact", "cached", "estimated")
+
+# Per process; other workers converge through the TTL
+_count_cache = TTLCache(
+    maxsize=settings.COUNT_CACHE_SIZE,
+    ttl=settings.COUNT_CACHE_TTL_SECONDS
+)
+
+async def _exact_count(db: AsyncSession, query: Select) -> int:
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    return total or 0
+
+async def _table_estimate(db: AsyncSession, table_name: str) -> int | None:
+    estimate = await db.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table_name}
+    )
+    # -1 / 0 means the table was never analyzed
+    if estimate is None or estimate <= 0:
+        return None
+    return estimate
+
+async def _plan_estimate(db: AsyncSession, query: Select) -> int | None:
+    compiled = query.compile(
+        dialect=db.bind.dialect,
+        compile_kwargs={"literal_binds": True}
+    )
+    plan = await db.scalar(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (KeyError, IndexError, TypeError):
+        return None
+
+async def count(
+    db: AsyncSession,
+    query: Select,
+    cache_key: Hashable,
+    unfiltered_table: str | None = None,
+    strategy: str | None = None
+) -> tuple[int, bool]:
+    """
+    Count the rows of `query` using the configured strategy.
+    `unfiltered_table` names the table when the query has no filters beyond
+    soft-delete, so pg_class statistics can stand in for a scan.
+    Returns (total, is_exact).
+    """
+    strategy = strategy or settings.COUNT_STRATEGY
+
+    if strategy == "estimated":
+        if unfiltered_table:
+            estimate = await _table_estimate(db, unfiltered_table)
+        else:
+            estimate = await _plan_estimate(db, query)
+        if estimate is not None and estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+            return estimate, False
+        return await _exact_count(db, query), True
+
+    if strategy == "cached":
+        total = _count_cache.get(cache_key)
+        if total is None:
+            total = await _exact_count(db, query)
+            _count_cache.set(cache_key, total)
+        return total, False
+
+    return await _exact_count(db, query), True
+
+def invalidate_counts() -> None:
+    """
+    Called when a rice is created, deleted or renamed, or its theme tags change.
+    Any listing filter might match the rice, so every cached count is dropped
+    rather than guessing which.
+    """
+    _count_cache.clear()
+
+def invalidate_on_commit(db: AsyncSession) -> None:
+    """Drop every cached count once `db` commits."""
+    after_commit(db, invalidate_counts)
+
+def cache_stats() -> dict:
+    return _count_cache.stats()
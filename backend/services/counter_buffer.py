@@ -0,0 +1,337 @@
+from sqlalchemy import select, update, values, column, literal, Integer, DateTime
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import text, tuple_
+from datetime import datetime, timezone, date
+from models.rice import Rice, RiceActivity, RiceUniqueViewers
+from services.hll import HyperLogLog
+from config.settings import settings
+from db.session import AsyncSessionLocal
+from db import query_stats
+import asyncio
+import fcntl
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant key serializing sketch merges across workers
+_VIEWER_SKETCH_LOCK_ID = 7_310_418
+
+class CounterBuffer:
+    """
+    Write-behind buffer for rice view and dotfile-click counters, and for
+    the per-day unique-viewer sketches.
+
+    Increments are summed per rice in memory and written as one
+    UPDATE ... FROM (VALUES ...) every `interval` seconds or once `threshold`
+    increments are pending. With a journal path every increment is appended to
+    a local file first (one per worker process, <path>.<pid>.journal), and
+    journals of workers that died are claimed and replayed on startup, so a
+    crashed worker loses nothing (a crash mid-flush can double count one batch).
+    """
+
+    def __init__(self, interval: float, threshold: int, journal_path: str | None = None):
+        self.interval = interval
+        self.threshold = threshold
+        self.journal_path = journal_path
+        self.flushed_batches = 0
+        self.failed_flushes = 0
+        self._pending: dict[int, list[int]] = {}
+        self._pending_total = 0
+        self._viewers: dict[tuple[int, date], HyperLogLog] = {}
+        self._journal = None
+        self._journal_file: str | None = None
+        # Held for the worker's lifetime; a lockable pid lock means that worker is gone
+        self._worker_lock = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self._loop_task: asyncio.Task | None = None
+
+    def add(self, rice_id: int, views: int = 0, dotfile_clicks: int = 0) -> None:
+        counts = self._pending.setdefault(rice_id, [0, 0])
+        counts[0] += views
+        counts[1] += dotfile_clicks
+        self._pending_total += views + dotfile_clicks
+
+        if self._journal is not None:
+            self._journal.write(f"{rice_id} {views} {dotfile_clicks}\n")
+            self._journal.flush()
+
+        if self._pending_total >= self.threshold and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_in_background())
+
+    def add_viewer(self, rice_id: int, viewer_hash: int) -> None:
+        day = datetime.now(timezone.utc).date()
+        self._observe_viewer(rice_id, day, viewer_hash)
+        if self._journal is not None:
+            self._journal.write(f"v {rice_id} {day.isoformat()} {viewer_hash:x}\n")
+            self._journal.flush()
+
+    def pending_viewers(self, rice_id: int, since: date) -> list[HyperLogLog]:
+        return [
+            sketch
+            for (sketch_rice_id, day), sketch in self._viewers.items()
+            if sketch_rice_id == rice_id and day >= since
+        ]
+
+    def pending(self, rice_id: int) -> tuple[int, int]:
+        """Increments not yet written, so reads can show a viewer their own view."""
+        views, dotfile_clicks = self._pending.get(rice_id, (0, 0))
+        return views, dotfile_clicks
+
+    async def start(self) -> None:
+        if self.journal_path:
+            self._replay_journals()
+        self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+        await self.flush()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self._worker_lock is not None:
+            # The journal is empty after the final flush unless that flush failed; leave it for the next start
+            self._worker_lock.close()
+            self._worker_lock = None
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._pending and not self._viewers:
+                return
+            batch = self._pending
+            viewers = self._viewers
+            self._pending = {}
+            self._pending_total = 0
+            self._viewers = {}
+            flushing_journal = self._rotate_journal()
+
+            try:
+                await self._write(batch, viewers)
+            except Exception:
+                logger.exception("Counter flush failed; keeping %d rice(s) for the next attempt", len(batch))
+                self.failed_flushes += 1
+                for rice_id, (views, dotfile_clicks) in batch.items():
+                    counts = self._pending.setdefault(rice_id, [0, 0])
+                    counts[0] += views
+                    counts[1] += dotfile_clicks
+                    self._pending_total += views + dotfile_clicks
+                for key, sketch in viewers.items():
+                    self._merge_viewers(key, sketch)
+                self._restore_journal(flushing_journal)
+                return
+
+            self.flushed_batches += 1
+            if flushing_journal:
+                os.remove(flushing_journal)
+
+    async def _flush_in_background(self) -> None:
+        # Spawned from the request that crossed the threshold, but the flush isn't that request's SQL
+        query_stats.detach()
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending_rices": len(self._pending),
+            "pending_viewer_sketches": len(self._viewers),
+            "pending_increments": self._pending_total,
+            "flushed_batches": self.flushed_batches,
+            "failed_flushes": self.failed_flushes
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def _write(self, batch: dict[int, list[int]], viewers: dict[tuple[int, date], HyperLogLog]) -> None:
+        async with AsyncSessionLocal() as db:
+            if batch:
+                await self._write_counters(db, batch)
+            if viewers:
+                await self._write_viewers(db, viewers)
+            await db.commit()
+
+    async def _write_viewers(self, db, viewers: dict[tuple[int, date], HyperLogLog]) -> None:
+        # Read-merge-write of sketches; serialized across workers for the transaction
+        await db.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": _VIEWER_SKETCH_LOCK_ID})
+
+        keys = list(viewers)
+        result = await db.execute(
+            select(RiceUniqueViewers.rice_id, RiceUniqueViewers.day, RiceUniqueViewers.sketch)
+            .where(tuple_(RiceUniqueViewers.rice_id, RiceUniqueViewers.day).in_(keys))
+        )
+        for rice_id, day, sketch in result.all():
+            viewers[(rice_id, day)].merge(HyperLogLog.from_bytes(sketch))
+
+        live_rice_ids = set(await db.scalars(
+            select(Rice.id).where(Rice.id.in_({rice_id for rice_id, _ in keys}))
+        ))
+        rows = [
+            {"rice_id": rice_id, "day": day, "sketch": sketch.to_bytes()}
+            for (rice_id, day), sketch in viewers.items()
+            if rice_id in live_rice_ids
+        ]
+        if not rows:
+            return
+
+        stmt = insert(RiceUniqueViewers).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RiceUniqueViewers.rice_id, RiceUniqueViewers.day],
+            set_={"sketch": stmt.excluded.sketch}
+        )
+        await db.execute(stmt)
+
+    async def _write_counters(self, db, batch: dict[int, list[int]]) -> None:
+        deltas = values(
+            column("rice_id", Integer),
+            column("views", Integer),
+            column("dotfile_clicks", Integer),
+            name="deltas"
+        ).data([
+            (rice_id, views, dotfile_clicks)
+            for rice_id, (views, dotfile_clicks) in batch.items()
+        ])
+        rices = Rice.__table__
+        bucket_start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+        # Joined against rices so increments for rices deleted meanwhile are dropped
+        activity = insert(RiceActivity).from_select(
+            ["rice_id", "bucket_start", "views", "dotfile_clicks"],
+            select(
+                deltas.c.rice_id,
+                literal(bucket_start, DateTime(timezone=True)),
+                deltas.c.views,
+                deltas.c.dotfile_clicks
+            ).join(rices, rices.c.id == deltas.c.rice_id)
+        )
+        activity = activity.on_conflict_do_update(
+            index_elements=[RiceActivity.rice_id, RiceActivity.bucket_start],
+            set_={
+                "views": RiceActivity.views + activity.excluded.views,
+                "dotfile_clicks": RiceActivity.dotfile_clicks + activity.excluded.dotfile_clicks
+            }
+        )
+
+        await db.execute(
+            update(rices)
+            .where(rices.c.id == deltas.c.rice_id)
+            .values(
+                views=rices.c.views + deltas.c.views,
+                dotfile_clicks=rices.c.dotfile_clicks + deltas.c.dotfile_clicks,
+                ranking_dirty=True,
+                # Counters are not an edit of the rice
+                date_updated=rices.c.date_updated
+            )
+        )
+        await db.execute(activity)
+
+    def _observe_viewer(self, rice_id: int, day: date, viewer_hash: int) -> None:
+        sketch = self._viewers.get((rice_id, day))
+        if sketch is None:
+            sketch = self._viewers[(rice_id, day)] = HyperLogLog()
+        sketch.add_hash(viewer_hash)
+
+    def _merge_viewers(self, key: tuple[int, date], sketch: HyperLogLog) -> None:
+        existing = self._viewers.get(key)
+        if existing is None:
+            self._viewers[key] = sketch
+        else:
+            existing.merge(sketch)
+
+    def _rotate_journal(self) -> str | None:
+        if self._journal is None:
+            return None
+        self._journal.close()
+        flushing = f"{self.journal_path}.{os.getpid()}.{self.flushed_batches}.flushing"
+        os.replace(self._journal_file, flushing)
+        self._journal = open(self._journal_file, "a")
+        return flushing
+
+    def _restore_journal(self, flushing: str | None) -> None:
+        if not flushing:
+            return
+        with open(flushing) as leftover:
+            self._journal.write(leftover.read())
+        self._journal.flush()
+        os.remove(flushing)
+
+    def _replay_journals(self) -> None:
+        """
+        Lock this worker's pid, then claim the journals and unfinished flush
+        batches of every worker whose pid lock is free (it exited or crashed).
+        Their lines are folded into this worker's journal and fsynced before
+        the originals are removed, so a second crash still keeps them; the
+        directory lock keeps two starting workers from claiming the same files.
+        """
+        directory = os.path.dirname(os.path.abspath(self.journal_path))
+        base = os.path.basename(self.journal_path)
+        worker_file = re.compile(re.escape(base) + r"\.(\d+)\.(?:journal|lock|\d+\.flushing)$")
+        pid = os.getpid()
+
+        with open(f"{self.journal_path}.lock", "a") as directory_lock:
+            fcntl.flock(directory_lock, fcntl.LOCK_EX)
+
+            # Live pids are unique, so our own lock is always free; files already under it are a dead predecessor's
+            self._worker_lock = open(f"{self.journal_path}.{pid}.lock", "a")
+            fcntl.flock(self._worker_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self._journal_file = f"{self.journal_path}.{pid}.journal"
+
+            files_by_pid: dict[int, list[str]] = {}
+            for name in os.listdir(directory):
+                match = worker_file.match(name)
+                if match:
+                    files_by_pid.setdefault(int(match.group(1)), []).append(os.path.join(directory, name))
+
+            claimed: list[str] = []
+            orphan_locks = []
+            for other_pid, paths in files_by_pid.items():
+                if other_pid != pid:
+                    lock = open(f"{self.journal_path}.{other_pid}.lock", "a")
+                    try:
+                        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        lock.close()  # that worker is alive and owns its files
+                        continue
+                    orphan_locks.append(lock)
+                claimed.extend(path for path in paths if not path.endswith(".lock") and path != self._journal_file)
+
+            journal = open(self._journal_file, "a+")
+            for path in claimed:
+                with open(path) as leftover:
+                    journal.write(leftover.read())
+            journal.flush()
+            os.fsync(journal.fileno())
+            journal.seek(0)
+
+            for line in journal:
+                parts = line.split()
+                if len(parts) == 4 and parts[0] == "v":
+                    self._observe_viewer(int(parts[1]), date.fromisoformat(parts[2]), int(parts[3], 16))
+                    continue
+                if len(parts) != 3:
+                    continue  # torn final line from a crash
+                rice_id, views, dotfile_clicks = map(int, parts)
+                counts = self._pending.setdefault(rice_id, [0, 0])
+                counts[0] += views
+                counts[1] += dotfile_clicks
+                self._pending_total += views + dotfile_clicks
+            self._journal = journal
+
+            for path in claimed:
+                os.remove(path)
+            for lock in orphan_locks:
+                os.remove(lock.name)
+                lock.close()
+
+        if self._pending_total:
+            logger.info("Replayed %d pending counter increment(s) from journal", self._pending_total)
+
+counter_buffer = CounterBuffer(
+    interval=settings.COUNTER_FLUSH_SECONDS,
+    threshold=settings.COUNTER_FLUSH_THRESHOLD,
+    journal_path=settings.COUNTER_JOURNAL_PATH
+)
@@ -0,0 +1,91 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from collections import OrderedDict
+from config.settings import settings
+from db.hooks import after_commit
+import json
+import threading
+import time
+
+class RiceDetailCache:
+    """
+    Serialized RiceOut payloads keyed by rice id, bounded by entry count and
+    total bytes (least recently used entries go first).
+
+    Each entry carries the validator stamp it was built under, and a lookup
+    with a different stamp is a miss - so a write committed by another worker
+    is never served stale even though invalidation here is per process. Live
+    counters (views, dotfile clicks) are not part of the stamp; callers overlay
+    them on read.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[int, tuple[float, tuple, bytes]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, rice_id: int, stamp: tuple) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(rice_id)
+            if entry is None or entry[0] <= time.monotonic() or entry[1] != stamp:
+                if entry is not None:
+                    self._remove(rice_id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(rice_id)
+            self.hits += 1
+            payload = entry[2]
+        return json.loads(payload)
+
+    def set(self, rice_id: int, stamp: tuple, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(rice_id)
+            self._entries[rice_id] = (time.monotonic() + self.ttl, stamp, payload)
+            self._bytes += len(payload)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, rice_id: int) -> None:
+        with self._lock:
+            self._remove(rice_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "evictions": self.evictions
+        }
+
+    def _remove(self, rice_id: int) -> None:
+        entry = self._entries.pop(rice_id, None)
+        if entry is not None:
+            self._bytes -= len(entry[2])
+
+detail_cache = RiceDetailCache(
+    max_entries=settings.DETAIL_CACHE_MAX_ENTRIES,
+    max_bytes=settings.DETAIL_CACHE_MAX_BYTES,
+    ttl=settings.DETAIL_CACHE_TTL_SECONDS
+)
+
+def invalidate_on_commit(db: AsyncSession, rice_id: int) -> None:
+    """Drop the cached detail payload of `rice_id` once `db` commits."""
+    after_commit(db, lambda: detail_cache.invalidate(rice_id))
@@ -1,7 +1,10 @@
 from config.settings import settings
+from fastapi import HTTPException, status
 from urllib.parse import urlencode
-import secrets
-import httpx
+from services import http_client, metrics
+import asyncio
+import re
+import time
 import jwt
 
 def build_auth_url(state: str) -> str:
@@ -16,6 +19,10 @@ def build_auth_url(state: str) -> str:
     }
     return f"{settings.GOOGLE_AUTH_URL}?{urlencode(params)}"
 
+token_exchange_seconds = metrics.Histogram(
+    "oauth_token_exchange_seconds", "Google authorization code exchange latency", ("outcome",)
+)
+
 async def exchange_code_for_tokens(code: str) -> dict:
     token_data = {
         "code": code,
@@ -24,10 +31,79 @@ async def exchange_code_for_tokens(code: str) -> dict:
         "redirect_uri": settings.GOOGLE_REDIRECT_URI,
         "grant_type": "authorization_code"
     }
-    async with httpx.AsyncClient() as client:
-        response = await client.post(settings.GOOGLE_TOKEN_URL, data=token_data)
-    response.raise_for_status()
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        response = await http_client.get_client().post(settings.GOOGLE_TOKEN_URL, data=token_data)
+        response.raise_for_status()
+        outcome = "ok"
+    finally:
+        token_exchange_seconds.observe(time.perf_counter() - started, outcome)
     return response.json()
 
-def decode_id_token(id_token: str) -> dict:
-    return jwt.decode(id_token, options={"verify_signature": False})
\ No newline at end of file
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+class JWKSCache:
+    """
+    Google's signing keys, fetched once and kept for as long as the JWKS
+    response's Cache-Control allows. An unknown kid triggers at most one
+    refetch per `min_refresh` seconds, so forged tokens can't force a fetch
+    per request.
+    """
+
+    def __init__(self, url: str, default_ttl: float = 3600, min_refresh: float = 60):
+        self.url = url
+        self.default_ttl = default_ttl
+        self.min_refresh = min_refresh
+        self.fetches = 0
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get_key(self, kid: str) -> jwt.PyJWK | None:
+        now = time.monotonic()
+        if now >= self._expires_at or (kid not in self._keys and now - self._fetched_at >= self.min_refresh):
+            async with self._lock:
+                # Another request may have refreshed while we waited
+                now = time.monotonic()
+                if now >= self._expires_at or (kid not in self._keys and now - self._fetched_at >= self.min_refresh):
+                    await self._refresh()
+        return self._keys.get(kid)
+
+    async def _refresh(self) -> None:
+        response = await http_client.get_client().get(self.url)
+        response.raise_for_status()
+        key_set = jwt.PyJWKSet.from_dict(response.json())
+        self.fetches += 1
+
+        ttl = self.default_ttl
+        match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+        if match:
+            ttl = max(int(match.group(1)) - int(response.headers.get("age", 0)), 0)
+
+        self._keys = {key.key_id: key for key in key_set.keys if key.key_id}
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + ttl
+
+google_jwks = JWKSCache(settings.GOOGLE_JWKS_URL)
+
+async def decode_id_token(id_token: str) -> dict:
+    """Verify the id_token's signature, audience, issuer and expiry and return its claims."""
+    try:
+        kid = jwt.get_unverified_header(id_token).get("kid")
+        signing_key = await google_jwks.get_key(kid) if kid else None
+        if signing_key is None:
+            raise jwt.InvalidTokenError("Unknown signing key")
+        return jwt.decode(
+            id_token,
+            signing_key.key,
+            algorithms=["RS256"],
+            audience=settings.GOOGLE_CLIENT_ID,
+            issuer=settings.GOOGLE_ISSUERS
+        )
+    except jwt.InvalidTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid ID token"
+        )
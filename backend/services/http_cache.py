@@ -0,0 +1,58 @@
+from fastapi import Request, Response, status
+import hashlib
+
+# Cache-Control policies. Anything requested with the session cookie is kept out
+# of shared caches; anonymous reads may be stored by browsers and CDNs.
+PRIVATE_REVALIDATE = "private, no-cache"
+PUBLIC_REVALIDATE = "public, no-cache"
+PUBLIC_LISTING = "public, max-age=10, stale-while-revalidate=30"
+
+def weak_etag(*parts) -> str:
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode(), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+def body_etag(body: bytes) -> str:
+    return f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+def cache_control(request: Request, public_policy: str = PUBLIC_REVALIDATE) -> str:
+    if "access_token" in request.cookies:
+        return PRIVATE_REVALIDATE
+    return public_policy
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against If-None-Match, as RFC 9110 requires for GET."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+def set_validators(response: Response, etag: str, policy: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = policy
+    response.headers["Vary"] = "Cookie"
+
+def not_modified(etag: str, policy: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, policy)
+    return response
+
+def conditional_response(
+    request: Request,
+    body: bytes,
+    public_policy: str = PUBLIC_REVALIDATE,
+    media_type: str = "application/json"
+) -> Response:
+    """Wrap an already-serialized body, answering 304 if the client has it."""
+    etag = body_etag(body)
+    policy = cache_control(request, public_policy)
+    if etag_matches(request, etag):
+        return not_modified(etag, policy)
+    response = Response(content=body, media_type=media_type)
+    set_validators(response, etag, policy)
+    return response
@@ -0,0 +1,37 @@
+from config.settings import settings
+import httpx
+
+# One pooled client per process, opened and closed by the app lifespan, so
+# outbound calls reuse keep-alive connections instead of handshaking each time.
+_client: httpx.AsyncClient | None = None
+
+def _build_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            settings.HTTP_TIMEOUT_SECONDS,
+            connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS
+        )
+    )
+
+async def start() -> None:
+    global _client
+    if _client is None:
+        _client = _build_client()
+
+async def stop() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+def get_client() -> httpx.AsyncClient:
+    """The shared client; created on first use outside the app (scripts, tests)."""
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
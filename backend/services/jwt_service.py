@@ -1,24 +1,53 @@
 import jwt
+import hashlib
+import time
 from datetime import datetime, timedelta
 from config.settings import settings
 from fastapi import HTTPException, status, Cookie
+from utils.cache import TTLCache
+
+ACCESS_TOKEN_LIFETIME = timedelta(days=7)
+
+# Verified tokens by digest -> user_id, each kept until its own exp. Only successful
+# verifications are cached, so expired and invalid tokens fail exactly as before.
+_verified_tokens = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE)
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
 
 def create_access_token(user_id: int) -> str:
     payload = {
         "user_id": user_id,
-        "exp": datetime.utcnow() + timedelta(days=7),
+        "exp": datetime.utcnow() + ACCESS_TOKEN_LIFETIME,
     }
     token = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm="HS256")
     return token
   
 def verify_access_token(token: str) -> int:
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"])
-        return payload["user_id"]
-    except jwt.ExpiredSignatureError:
-        raise ValueError("Token has expired")
-    except jwt.InvalidTokenError:
-        raise ValueError("Invalid token")
+    digest = _token_digest(token)
+    user_id = _verified_tokens.get(digest)
+    if user_id is None:
+        try:
+            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"])
+        except jwt.ExpiredSignatureError:
+            raise ValueError("Token has expired")
+        except jwt.InvalidTokenError:
+            raise ValueError("Invalid token")
+        user_id = payload["user_id"]
+        _verified_tokens.set(digest, user_id, ttl=payload["exp"] - time.time())
+
+    return user_id
+
+def evict_token(token: str) -> None:
+    """Forget the cached verification of `token` (logout)."""
+    _verified_tokens.delete(_token_digest(token))
+
+def evict_user(user_id: int) -> None:
+    """Forget every cached verification for `user_id` (account deletion)."""
+    _verified_tokens.delete_values(user_id)
+
+def token_cache_stats() -> dict:
+    return _verified_tokens.stats()
 
 async def get_current_user(access_token: str = Cookie(None)) -> int:
     if not access_token:
@@ -33,4 +62,13 @@ async def get_current_user(access_token: str = Cookie(None)) -> int:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+async def get_optional_user(access_token: str = Cookie(None)) -> int | None:
+    """Like get_current_user, but anonymous or invalid sessions yield None."""
+    if not access_token:
+        return None
+    try:
+        return verify_access_token(access_token)
+    except ValueError:
+        return None
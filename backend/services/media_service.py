@@ -1,8 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, insert, update, values, column, func, Integer
 from fastapi import HTTPException, status
 from models.rice import ThemeMedia, Theme, Rice
 from schemas.theme_media import ThemeMediaCreate, ThemeMediaUpdate
+from services import rice_summary_service, card_cache, detail_cache, ownership_service
 
 async def create_theme_media(
     db: AsyncSession,
@@ -18,9 +19,61 @@ async def create_theme_media(
     )
     db.add(new_media)
     await db.flush()
+
+    rice_id = await rice_summary_service.refresh_preview_for_theme(db, theme_id)
+    card_cache.invalidate_on_commit(db, card_cache.rice_tag(rice_id))
+    detail_cache.invalidate_on_commit(db, rice_id)
     
     return new_media
 
+_MEDIA_COLUMNS = (
+    ThemeMedia.id,
+    ThemeMedia.theme_id,
+    ThemeMedia.url,
+    ThemeMedia.media_type,
+    ThemeMedia.display_order,
+    ThemeMedia.thumbnail_url,
+    ThemeMedia.date_added
+)
+
+def media_row(theme_id: int, media_data: ThemeMediaCreate) -> dict:
+    return {
+        "theme_id": theme_id,
+        "url": str(media_data.url),
+        "media_type": media_data.media_type,
+        "display_order": media_data.display_order,
+        "thumbnail_url": str(media_data.thumbnail_url) if media_data.thumbnail_url else None
+    }
+
+async def insert_media_rows(
+    db: AsyncSession,
+    rows: list[dict]
+) -> list[dict]:
+    """
+    Insert media rows with multi-row INSERT ... RETURNING (batched by SQLAlchemy)
+    and return them as ThemeMediaOut-shaped dicts in input order. No summary upkeep.
+    """
+    if not rows:
+        return []
+    result = await db.execute(
+        insert(ThemeMedia).returning(*_MEDIA_COLUMNS, sort_by_parameter_order=True),
+        rows
+    )
+    return [dict(row) for row in result.mappings().all()]
+
+async def create_theme_media_bulk(
+    db: AsyncSession,
+    theme_id: int,
+    media_list: list[ThemeMediaCreate]
+) -> list[dict]:
+    """Add many media to a theme in one INSERT; the caller commits."""
+    created = await insert_media_rows(db, [media_row(theme_id, media_data) for media_data in media_list])
+
+    rice_id = await rice_summary_service.refresh_preview_for_theme(db, theme_id)
+    card_cache.invalidate_on_commit(db, card_cache.rice_tag(rice_id))
+    detail_cache.invalidate_on_commit(db, rice_id)
+    return created
+
 async def get_media_by_id(
     db: AsyncSession,
     media_id: int
@@ -49,20 +102,11 @@ async def get_media_by_theme(
 async def update_theme_media(
     db: AsyncSession,
     media_id: int,
-    user_id: int,
     media_data: ThemeMediaUpdate
 ) -> ThemeMedia:
+    """Callers authorize through ownership_service."""
     media = await get_media_by_id(db, media_id)
     
-    theme = await db.get(Theme, media.theme_id)
-    rice = await db.get(Rice, theme.rice_id)
-    
-    if rice.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this media"
-        )
-    
     if media_data.url is not None:
         media.url = str(media_data.url)
     if media_data.display_order is not None:
@@ -70,6 +114,9 @@ async def update_theme_media(
     if media_data.thumbnail_url is not None:
         media.thumbnail_url = str(media_data.thumbnail_url)
     
+    rice_id = await rice_summary_service.refresh_preview_for_theme(db, media.theme_id)
+    card_cache.invalidate_on_commit(db, card_cache.rice_tag(rice_id))
+    detail_cache.invalidate_on_commit(db, rice_id)
     await db.commit()
     await db.refresh(media)
     return media
@@ -80,46 +127,62 @@ async def reorder_media(
     user_id: int,
     media_order: list[dict]
 ) -> list[ThemeMedia]:
-    theme = await db.get(Theme, theme_id)
-    rice = await db.get(Rice, theme.rice_id)
-    
-    if rice.user_id != user_id:
+    """
+    Apply new display orders in one UPDATE ... FROM (VALUES ...), after a single
+    query that both authorizes `user_id` against the theme's rice and checks that
+    every media id belongs to the theme.
+    """
+    media_ids = [item["media_id"] for item in media_order]
+    if len(set(media_ids)) != len(media_ids):
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to reorder media"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each media may appear only once"
+        )
+
+    member_count = (
+        select(func.count(ThemeMedia.id))
+        .where(ThemeMedia.theme_id == theme_id, ThemeMedia.id.in_(media_ids))
+        .scalar_subquery()
+    )
+    row = (await db.execute(
+        select(Theme.rice_id, Rice.user_id, member_count)
+        .join(Rice, Rice.id == Theme.rice_id)
+        .where(Theme.id == theme_id, Rice.is_deleted == False)
+    )).one_or_none()
+    ownership_service.check_owner("theme", row.user_id if row else None, user_id)
+    rice_id, _, found = row
+    if found != len(media_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Some media don't belong to theme {theme_id}"
+        )
+
+    if media_order:
+        positions = values(
+            column("id", Integer),
+            column("display_order", Integer),
+            name="positions"
+        ).data([(item["media_id"], item["display_order"]) for item in media_order])
+        await db.execute(
+            update(ThemeMedia.__table__)
+            .where(ThemeMedia.id == positions.c.id)
+            .values(display_order=positions.c.display_order)
         )
     
-    for item in media_order:
-        media = await get_media_by_id(db, item["media_id"])
-        
-        if media.theme_id != theme_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Media {item['media_id']} doesn't belong to theme {theme_id}"
-            )
-        
-        media.display_order = item["display_order"]
-    
+    await rice_summary_service.refresh_preview_for_theme(db, theme_id)
+    card_cache.invalidate_on_commit(db, card_cache.rice_tag(rice_id))
+    detail_cache.invalidate_on_commit(db, rice_id)
     await db.commit()
     
     return await get_media_by_theme(db, theme_id)
 
 async def delete_theme_media(
     db: AsyncSession,
-    media_id: int,
-    user_id: int
+    media_id: int
 ) -> None:
+    """Callers authorize through ownership_service."""
     media = await get_media_by_id(db, media_id)
     
-    theme = await db.get(Theme, media.theme_id)
-    rice = await db.get(Rice, theme.rice_id)
-    
-    if rice.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete this media"
-        )
-    
     media_count = await db.scalar(
         select(func.count(ThemeMedia.id))
         .where(ThemeMedia.theme_id == media.theme_id)
@@ -132,4 +195,8 @@ async def delete_theme_media(
         )
     
     await db.delete(media)
+    rice_id = await rice_summary_service.refresh_preview_for_theme(db, media.theme_id)
+    card_cache.invalidate_on_commit(db, card_cache.rice_tag(rice_id))
+    detail_cache.invalidate_on_commit(db, rice_id)
+    ownership_service.invalidate_on_commit(db, "media", media_id)
     await db.commit()
\ No newline at end of file
@@ -0,0 +1,109 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from fastapi import Depends, HTTPException, status
+from models.rice import Rice, Theme, ThemeMedia, Review
+from config.settings import settings
+from db.hooks import after_commit
+from db.session import get_db
+from utils.cache import TTLCache
+from services.jwt_service import get_current_user
+
+# kind -> statement resolving an object id to its owner's user id in one indexed join
+_OWNER_QUERIES = {
+    "rice": lambda obj_id: select(Rice.user_id).where(Rice.id == obj_id),
+    "theme": lambda obj_id: (
+        select(Rice.user_id)
+        .join(Theme, Theme.rice_id == Rice.id)
+        .where(Theme.id == obj_id)
+    ),
+    "media": lambda obj_id: (
+        select(Rice.user_id)
+        .join(Theme, Theme.rice_id == Rice.id)
+        .join(ThemeMedia, ThemeMedia.theme_id == Theme.id)
+        .where(ThemeMedia.id == obj_id)
+    ),
+    "review": lambda obj_id: select(Review.user_id).where(Review.id == obj_id),
+}
+
+_LABELS = {"rice": "Rice", "theme": "Theme", "media": "Media", "review": "Review"}
+
+# Owners never change while an object exists, so entries only go stale through deletes
+_owner_cache = TTLCache(
+    maxsize=settings.OWNERSHIP_CACHE_SIZE,
+    ttl=settings.OWNERSHIP_CACHE_TTL_SECONDS
+)
+
+async def get_owner_id(
+    db: AsyncSession,
+    kind: str,
+    obj_id: int
+) -> int | None:
+    owner_id = _owner_cache.get((kind, obj_id))
+    if owner_id is None:
+        owner_id = await db.scalar(_OWNER_QUERIES[kind](obj_id))
+        if owner_id is not None:
+            _owner_cache.set((kind, obj_id), owner_id)
+    return owner_id
+
+async def authorize(
+    db: AsyncSession,
+    kind: str,
+    obj_id: int,
+    user_id: int
+) -> None:
+    """404 if the object doesn't exist, 403 if `user_id` doesn't own it."""
+    check_owner(kind, await get_owner_id(db, kind, obj_id), user_id)
+
+def check_owner(kind: str, owner_id: int | None, user_id: int) -> None:
+    """authorize for callers that fetched the owner themselves, e.g. joined into another query."""
+    if owner_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{_LABELS[kind]} not found"
+        )
+    if owner_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Not authorized to modify this {kind}"
+        )
+
+def invalidate_on_commit(db: AsyncSession, kind: str, obj_id: int) -> None:
+    """Forget the cached owner of a deleted object once `db` commits."""
+    after_commit(db, lambda: _owner_cache.delete((kind, obj_id)))
+
+def cache_stats() -> dict:
+    return _owner_cache.stats()
+
+# Router dependencies: authorize the path object against the session user and return the user id
+
+async def require_rice_owner(
+    rice_id: int,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+) -> int:
+    await authorize(db, "rice", rice_id, user_id)
+    return user_id
+
+async def require_theme_owner(
+    theme_id: int,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+) -> int:
+    await authorize(db, "theme", theme_id, user_id)
+    return user_id
+
+async def require_media_owner(
+    media_id: int,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+) -> int:
+    await authorize(db, "media", media_id, user_id)
+    return user_id
+
+async def require_review_owner(
+    review_id: int,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user)
+) -> int:
+    await authorize(db, "review", review_id, user_id)
+    return user_id
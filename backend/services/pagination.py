@@ -0,0 +1,42 @@
+from fastapi import HTTPException, status
+from datetime import datetime
+import base64
+import json
+
+def encode_cursor(kind: str, key, row_id: int, direction: str = "next") -> str:
+    """
+    Build an opaque keyset cursor. `kind` ties the cursor to the listing and
+    sort it came from so it can't be replayed against a different ordering.
+    """
+    if isinstance(key, datetime):
+        key_type, key = "dt", key.isoformat()
+    else:
+        key_type = "v"
+    payload = {"k": kind, "t": key_type, "v": key, "id": row_id, "d": direction}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def decode_cursor(cursor: str, kind: str) -> tuple[object, int, str]:
+    """Returns (key, row_id, direction) or raises 400 for a malformed or foreign cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = payload["v"]
+        if payload["t"] == "dt":
+            key = datetime.fromisoformat(key)
+        row_id = int(payload["id"])
+        direction = payload["d"]
+        cursor_kind = payload["k"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    if cursor_kind != kind or direction not in ("next", "prev"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match this listing or sort order"
+        )
+
+    return key, row_id, direction
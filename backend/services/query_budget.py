@@ -0,0 +1,89 @@
+"""
+Per-route SQL budgets. Routes declare how many statements they may run and how
+often any one statement shape may repeat:
+
+    @router.get("/{rice_id}")
+    @query_budget(statements=2)
+    async def get_rice(...): ...
+
+RequestMetricsMiddleware checks the request's statements when the response
+starts. A breach is logged in production and raises QueryBudgetExceeded with
+QUERY_BUDGET_STRICT set, so tests and CI fail on query-count regressions.
+Routes without a budget are still flagged when one statement shape runs
+QUERY_REPEAT_WARN_THRESHOLD times or more, the usual sign of a per-row query.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from config.settings import settings
+from services import metrics
+from db.query_stats import QueryStats
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+breaches = metrics.Counter(
+    "query_budget_breaches_total", "Requests that broke their route's SQL budget", ("route", "kind")
+)
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+@dataclass(frozen=True)
+class QueryBudget:
+    statements: int
+    repeats: int = 1
+
+def query_budget(statements: int, repeats: int = 1):
+    """Declare the route's budget; goes below the @router decorator."""
+    budget = QueryBudget(statements, repeats)
+
+    def decorate(endpoint):
+        endpoint.__query_budget__ = budget
+        return endpoint
+    return decorate
+
+# Expanded IN lists render one placeholder per value; fold them so the shape ignores list length
+_PLACEHOLDER_LIST = re.compile(r"\$\d+(?:::[\w\s]+?)?(?:\s*,\s*\$\d+(?:::[\w\s]+?)?)*(?=\s*\))")
+
+@lru_cache(maxsize=4096)
+def statement_shape(statement: str) -> str:
+    return _PLACEHOLDER_LIST.sub("?", " ".join(statement.split()))
+
+def repeated_shapes(stats: QueryStats) -> dict[str, int]:
+    shapes: dict[str, int] = {}
+    for statement, count in stats.shapes.items():
+        shape = statement_shape(statement)
+        shapes[shape] = shapes.get(shape, 0) + count
+    return shapes
+
+def check(scope, route: str, stats: QueryStats) -> None:
+    if not stats.statements:
+        return
+    endpoint = getattr(scope.get("route"), "endpoint", None)
+    budget: QueryBudget | None = getattr(endpoint, "__query_budget__", None)
+
+    problems = []
+    if budget is None:
+        threshold = settings.QUERY_REPEAT_WARN_THRESHOLD
+        if stats.statements < threshold:
+            return
+        for shape, count in repeated_shapes(stats).items():
+            if count >= threshold:
+                breaches.inc(route, "n_plus_one")
+                logger.warning("Possible N+1 on %s %s: ran %d times: %.300s", scope["method"], route, count, shape)
+        return
+
+    if stats.statements > budget.statements:
+        breaches.inc(route, "statements")
+        problems.append(f"{stats.statements} statements, budget {budget.statements}")
+    for shape, count in repeated_shapes(stats).items():
+        if count > budget.repeats:
+            breaches.inc(route, "repeats")
+            problems.append(f"ran {count} times, budget {budget.repeats}: {shape[:300]}")
+
+    if problems:
+        message = f"Query budget exceeded on {scope['method']} {route}: " + "; ".join(problems)
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
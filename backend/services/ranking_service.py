@@ -0,0 +1,166 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import select, func, text
+from datetime import datetime, timezone, timedelta
+from models.rice import Rice, RiceActivity, RiceUniqueViewers, RankingState
+from config.settings import settings
+from db.session import AsyncSessionLocal
+from services import card_cache
+import asyncio
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+# Fixed origin for forward-decayed trending scores. Scores grow with time instead of
+# old ones shrinking, so rows with no new activity never need rewriting.
+TRENDING_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+# Arbitrary constant key so only one worker runs the job at a time
+_RANKING_LOCK_ID = 7_310_417
+
+# A shift in the site-wide mean this large re-scores every rice, not just dirty ones
+_GLOBAL_MEAN_TOLERANCE = 0.01
+
+def _bucket_start(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+async def record_activity(
+    db: AsyncSession,
+    rice_id: int,
+    views: int = 0,
+    dotfile_clicks: int = 0,
+    reviews: int = 0
+) -> None:
+    """Add engagement to the current hourly bucket; runs in the caller's transaction."""
+    stmt = insert(RiceActivity).values(
+        rice_id=rice_id,
+        bucket_start=_bucket_start(datetime.now(timezone.utc)),
+        views=views,
+        dotfile_clicks=dotfile_clicks,
+        reviews=reviews
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RiceActivity.rice_id, RiceActivity.bucket_start],
+        set_={
+            "views": RiceActivity.views + stmt.excluded.views,
+            "dotfile_clicks": RiceActivity.dotfile_clicks + stmt.excluded.dotfile_clicks,
+            "reviews": RiceActivity.reviews + stmt.excluded.reviews
+        }
+    )
+    await db.execute(stmt)
+
+_RECOMPUTE_SQL = text("""
+    WITH targets AS (
+        SELECT id FROM rices WHERE ranking_dirty OR CAST(:full AS boolean)
+    ),
+    weighted AS (
+        SELECT
+            a.rice_id,
+            extract(epoch FROM a.bucket_start - CAST(:epoch AS timestamptz)) / CAST(:tau AS double precision) AS x,
+            a.views * CAST(:view_weight AS double precision)
+                + a.dotfile_clicks * CAST(:click_weight AS double precision)
+                + a.reviews * CAST(:review_weight AS double precision) AS w
+        FROM rice_activity a
+        JOIN targets t ON t.id = a.rice_id
+        WHERE a.bucket_start >= CAST(:window_start AS timestamptz)
+    ),
+    peaked AS (
+        SELECT rice_id, x, w, max(x) OVER (PARTITION BY rice_id) AS peak
+        FROM weighted
+        WHERE w > 0
+    ),
+    trending AS (
+        -- log-sum-exp keeps exp() in range however far we are from the epoch
+        SELECT rice_id, max(peak) + ln(sum(w * exp(x - peak))) AS score
+        FROM peaked
+        GROUP BY rice_id
+    )
+    UPDATE rices SET
+        rating_score = (CAST(:prior_weight AS double precision) * CAST(:global_mean AS double precision) + rices.rating_sum)
+            / (CAST(:prior_weight AS double precision) + rices.reviews_count),
+        trending_score = coalesce(trending.score, 0),
+        ranking_dirty = false
+    FROM targets
+    LEFT JOIN trending ON trending.rice_id = targets.id
+    WHERE rices.id = targets.id
+""")
+
+async def recompute_rankings(
+    db: AsyncSession,
+    full: bool = False
+) -> int | None:
+    """
+    Score rices flagged ranking_dirty (or all of them with `full`):
+      rating_score   - Bayesian average, (C * m + sum) / (C + n) with site mean m
+      trending_score - log of forward-decayed weighted views, clicks and reviews
+    Returns the number of rescored rices, or None if another worker holds the job.
+    """
+    got_lock = await db.scalar(
+        text("SELECT pg_try_advisory_xact_lock(:lock_id)"),
+        {"lock_id": _RANKING_LOCK_ID}
+    )
+    if not got_lock:
+        await db.rollback()
+        return None
+
+    totals = (await db.execute(
+        select(func.sum(Rice.rating_sum), func.sum(Rice.reviews_count))
+        .where(Rice.is_deleted == False)
+    )).one()
+    rating_total, reviews_total = totals
+    global_mean = rating_total / reviews_total if reviews_total else settings.RANKING_DEFAULT_MEAN
+
+    state = await db.get(RankingState, 1)
+    if state is None:
+        state = RankingState(id=1)
+        db.add(state)
+    if state.global_mean_rating is None or abs(state.global_mean_rating - global_mean) > _GLOBAL_MEAN_TOLERANCE:
+        full = True
+
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        _RECOMPUTE_SQL,
+        {
+            "full": full,
+            "epoch": TRENDING_EPOCH,
+            "tau": settings.TRENDING_HALF_LIFE_HOURS * 3600 / math.log(2),
+            "window_start": now - timedelta(days=settings.TRENDING_WINDOW_DAYS),
+            "view_weight": settings.TRENDING_VIEW_WEIGHT,
+            "click_weight": settings.TRENDING_CLICK_WEIGHT,
+            "review_weight": settings.TRENDING_REVIEW_WEIGHT,
+            "prior_weight": settings.RANKING_PRIOR_WEIGHT,
+            "global_mean": global_mean
+        }
+    )
+    rescored = result.rowcount or 0
+
+    state.global_mean_rating = global_mean
+    state.last_run_at = now
+    await db.execute(
+        RiceActivity.__table__.delete().where(
+            RiceActivity.bucket_start < now - timedelta(days=settings.TRENDING_WINDOW_DAYS)
+        )
+    )
+    # Same window count_unique_viewers reads; older daily sketches are never merged again
+    await db.execute(
+        RiceUniqueViewers.__table__.delete().where(
+            RiceUniqueViewers.day < now.date() - timedelta(days=settings.UNIQUE_VIEWERS_WINDOW_DAYS - 1)
+        )
+    )
+    await db.commit()
+
+    if rescored:
+        card_cache.card_cache.invalidate([card_cache.sort_tag("top_rated"), card_cache.sort_tag("trending")])
+
+    return rescored
+
+async def run_periodically() -> None:
+    """Background loop started from the app lifespan."""
+    while True:
+        await asyncio.sleep(settings.RANKING_REFRESH_SECONDS)
+        try:
+            async with AsyncSessionLocal() as db:
+                await recompute_rankings(db)
+        except Exception:
+            logger.exception("Ranking recompute failed")
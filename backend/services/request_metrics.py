@@ -0,0 +1,100 @@
+from services import metrics, card_cache, detail_cache, ownership_service, jwt_service, query_budget, count_service, suggest_service
+from db import query_stats
+from db.session import pool_stats
+import time
+
+requests_total = metrics.Counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+)
+request_seconds = metrics.Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+in_flight = metrics.Gauge("http_requests_in_flight", "HTTP requests currently being served")
+request_statements = metrics.Histogram(
+    "db_statements_per_request", "SQL statements executed per request", ("method", "route"),
+    buckets=metrics.COUNT_BUCKETS
+)
+request_db_seconds = metrics.Histogram(
+    "db_time_per_request_seconds", "Time spent in SQL statements per request", ("method", "route")
+)
+
+def route_template(scope) -> str:
+    # The router stores the matched route in the scope; unmatched paths share one label
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+class RequestMetricsMiddleware:
+    """
+    Plain ASGI middleware: a few counter updates per request, no body buffering.
+    The route's SQL budget is checked as the response starts, so a strict-mode
+    breach still surfaces as a server error.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        stats, token = query_stats.begin()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                query_budget.check(scope, route_template(scope), stats)
+                status_code = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            query_stats.end(token)
+            in_flight.dec()
+
+            method, route = scope["method"], route_template(scope)
+            requests_total.inc(method, route, status_code)
+            request_seconds.observe(elapsed, method, route)
+            request_statements.observe(stats.statements, method, route)
+            request_db_seconds.observe(stats.seconds, method, route)
+
+@metrics.collector
+def _cache_metrics():
+    caches = {
+        "card_pages": card_cache.card_cache.stats(),
+        "rice_details": detail_cache.detail_cache.stats(),
+        "owners": ownership_service.cache_stats(),
+        "auth_tokens": jwt_service.token_cache_stats(),
+        "counts": count_service.cache_stats(),
+        "suggestions": suggest_service.cache_stats()
+    }
+    # Stale card pages are still served from cache
+    yield from metrics.family(
+        "cache_hits_total", "Cache lookups answered from the cache", "counter", "cache",
+        {name: stats["hits"] + stats.get("stale_hits", 0) for name, stats in caches.items()}
+    )
+    yield from metrics.family(
+        "cache_misses_total", "Cache lookups that missed", "counter", "cache",
+        {name: stats["misses"] for name, stats in caches.items()}
+    )
+    yield from metrics.family(
+        "cache_hit_ratio", "Share of lookups answered from the cache since start", "gauge", "cache",
+        {name: stats["hit_ratio"] for name, stats in caches.items()}
+    )
+
+@metrics.collector
+def _pool_metrics():
+    pools = pool_stats()
+    for key, documentation in (
+        ("checked_out", "Connections currently checked out"),
+        ("idle", "Idle connections in the pool"),
+        ("overflow", "Connections open beyond pool_size")
+    ):
+        yield from metrics.family(
+            f"db_pool_{key}", documentation, "gauge", "pool", {name: stats.get(key) for name, stats in pools.items()}
+        )
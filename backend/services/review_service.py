@@ -1,10 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, update, and_, func, tuple_, exists, literal, Integer
+from sqlalchemy.dialects.postgresql import insert, aggregate_order_by
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
-from models.rice import Review, Rice
-from models.user import User
+from models.rice import Review, ReviewHelpfulVote, Rice, RATING_VALUES
+from models.user import User, Profile
 from schemas.review import ReviewCreate, ReviewUpdate
+from services import rice_summary_service, card_cache, detail_cache, ownership_service, ranking_service
+from services.pagination import encode_cursor, decode_cursor
+from db.session import AsyncSessionLocal
 
 async def create_review(
     db: AsyncSession,
@@ -40,6 +44,17 @@ async def create_review(
         comment=review_data.comment
     )
     db.add(new_review)
+    await db.flush()
+    await rice_summary_service.apply_summary_delta(
+        db,
+        rice_id,
+        reviews_delta=1,
+        rating_delta=new_review.rating,
+        rating_counts_delta={new_review.rating: 1}
+    )
+    await ranking_service.record_activity(db, rice_id, reviews=1)
+    card_cache.invalidate_on_commit(db, card_cache.rice_tag(rice_id), card_cache.sort_tag("top_rated"))
+    detail_cache.invalidate_on_commit(db, rice_id)
     await db.commit()
     await db.refresh(new_review)
     
@@ -64,30 +79,90 @@ async def get_review_by_id(
     
     return review
 
+# sort_by -> (sort key, ascending); id breaks ties in the same direction
+_REVIEW_SORTS = {
+    "recent": (Review.date_created, False),
+    "helpful": (Review.helpful_count, False),
+    "rating_high": (Review.rating, False),
+    "rating_low": (Review.rating, True),
+}
+
+async def _keyset_page(
+    db: AsyncSession,
+    query,
+    sort_by: str,
+    cursor_kind: str,
+    skip: int,
+    limit: int,
+    cursor: str | None
+) -> tuple[list[Review], str | None]:
+    """
+    One page of `query` ordered by the sort's (key, id), located by `cursor`
+    when given and by OFFSET otherwise. Returns (reviews, next_cursor).
+    """
+    sort_key, ascending = _REVIEW_SORTS.get(sort_by, _REVIEW_SORTS["recent"])
+    position = tuple_(sort_key, Review.id)
+
+    if cursor:
+        key, last_id, _ = decode_cursor(cursor, cursor_kind)
+        query = query.where(position > tuple_(key, last_id) if ascending else position < tuple_(key, last_id))
+    else:
+        query = query.offset(skip)
+
+    if ascending:
+        query = query.order_by(sort_key.asc(), Review.id.asc())
+    else:
+        query = query.order_by(sort_key.desc(), Review.id.desc())
+
+    result = await db.execute(query.limit(limit + 1))
+    reviews = result.scalars().all()
+
+    next_cursor = None
+    if len(reviews) > limit:
+        reviews = reviews[:limit]
+        last = reviews[-1]
+        next_cursor = encode_cursor(cursor_kind, getattr(last, sort_key.key), last.id)
+    return reviews, next_cursor
+
 async def get_reviews_by_rice(
     db: AsyncSession,
     rice_id: int,
     skip: int = 0,
     limit: int = 20,
-    sort_by: str = "recent"
-) -> list[Review]:
+    sort_by: str = "recent",
+    cursor: str | None = None
+) -> tuple[list[Review], str | None]:
+    """Returns (reviews, next_cursor); with `cursor` the page is found by keyset instead of OFFSET."""
     query = select(Review).options(
         selectinload(Review.user).selectinload(User.profiles)
     ).where(Review.rice_id == rice_id)
-    
-    if sort_by == "helpful":
-        query = query.order_by(Review.helpful_count.desc())
-    elif sort_by == "rating_high":
-        query = query.order_by(Review.rating.desc())
-    elif sort_by == "rating_low":
-        query = query.order_by(Review.rating.asc())
-    else:
-        query = query.order_by(Review.date_created.desc())
-    
-    query = query.offset(skip).limit(limit)
-    
-    result = await db.execute(query)
-    return result.scalars().all()
+
+    return await _keyset_page(db, query, sort_by, f"reviews:rice:{rice_id}:{sort_by}", skip, limit, cursor)
+
+async def get_reviews_validator(
+    db: AsyncSession,
+    rice_id: int
+) -> tuple:
+    """
+    Aggregate stamp over a rice's reviews: changes on any create, edit, delete or
+    helpful vote, and when a reviewer renames their profile. Profiles carry no
+    update timestamp, so the usernames shown on the reviews are hashed instead.
+    """
+    result = await db.execute(
+        select(
+            func.count(Review.id),
+            func.max(Review.id),
+            func.max(func.coalesce(Review.date_updated, Review.date_created)),
+            func.sum(Review.helpful_count),
+            func.md5(func.string_agg(
+                func.coalesce(Profile.username, ""),
+                aggregate_order_by(literal("\n"), Review.id)
+            ))
+        )
+        .outerjoin(Profile, Profile.id == Review.user_id)
+        .where(Review.rice_id == rice_id)
+    )
+    return tuple(result.one())
 
 async def get_user_review_for_rice(
     db: AsyncSession,
@@ -108,33 +183,35 @@ async def get_reviews_by_user(
     db: AsyncSession,
     user_id: int,
     skip: int = 0,
-    limit: int = 20
-) -> list[Review]:
-    result = await db.execute(
+    limit: int = 20,
+    cursor: str | None = None
+) -> tuple[list[Review], str | None]:
+    """Returns (reviews, next_cursor), newest first."""
+    query = (
         select(Review)
         .options(selectinload(Review.rice))
         .where(Review.user_id == user_id)
-        .order_by(Review.date_created.desc())
-        .offset(skip)
-        .limit(limit)
     )
-    return result.scalars().all()
+
+    return await _keyset_page(db, query, "recent", f"reviews:user:{user_id}", skip, limit, cursor)
 
 async def update_review(
     db: AsyncSession,
     review_id: int,
-    user_id: int,
     review_data: ReviewUpdate
 ) -> Review:
+    """Callers authorize through ownership_service."""
     review = await get_review_by_id(db, review_id)
     
-    if review.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this review"
+    if review_data.rating is not None and review_data.rating != review.rating:
+        await rice_summary_service.apply_summary_delta(
+            db,
+            review.rice_id,
+            rating_delta=review_data.rating - review.rating,
+            rating_counts_delta={review.rating: -1, review_data.rating: 1}
         )
-    
-    if review_data.rating is not None:
+        card_cache.invalidate_on_commit(db, card_cache.rice_tag(review.rice_id), card_cache.sort_tag("top_rated"))
+        detail_cache.invalidate_on_commit(db, review.rice_id)
         review.rating = review_data.rating
     if review_data.comment is not None:
         review.comment = review_data.comment
@@ -145,57 +222,138 @@ async def update_review(
 
 async def mark_review_helpful(
     db: AsyncSession,
-    review_id: int
-) -> Review:
-    review = await get_review_by_id(db, review_id)
-    review.helpful_count += 1
+    review_id: int,
+    user_id: int
+) -> dict:
+    """
+    Record `user_id`'s helpful vote and return the review, in one statement:
+    the vote insert is a no-op for repeat votes (and for the author's own
+    review), and the counter only moves when a vote row was actually inserted.
+    """
+    from models.user import Profile
+
+    reviews = Review.__table__
+    vote = (
+        insert(ReviewHelpfulVote)
+        .from_select(
+            ["review_id", "user_id"],
+            select(literal(review_id, Integer), literal(user_id, Integer))
+            .where(exists().where(reviews.c.id == review_id, reviews.c.user_id != user_id))
+        )
+        .on_conflict_do_nothing(index_elements=["review_id", "user_id"])
+        .returning(ReviewHelpfulVote.review_id)
+        .cte("vote")
+    )
+    bumped = (
+        update(reviews)
+        .where(reviews.c.id == vote.c.review_id)
+        .values(
+            helpful_count=reviews.c.helpful_count + 1,
+            # A vote is not an edit of the review
+            date_updated=reviews.c.date_updated
+        )
+        .returning(reviews.c.id, reviews.c.helpful_count)
+        .cte("bumped")
+    )
+
+    result = await db.execute(
+        select(
+            Review.id,
+            Review.user_id,
+            Review.rice_id,
+            Review.rating,
+            Review.comment,
+            # The outer SELECT sees the pre-statement snapshot, so take the new count from the UPDATE
+            func.coalesce(bumped.c.helpful_count, Review.helpful_count).label("helpful_count"),
+            Review.date_created,
+            Review.date_updated,
+            Profile.username.label("username")
+        )
+        .outerjoin(bumped, bumped.c.id == Review.id)
+        .outerjoin(Profile, Profile.id == Review.user_id)
+        .where(Review.id == review_id)
+    )
+    review = result.mappings().one_or_none()
     await db.commit()
-    await db.refresh(review)
-    return review
+
+    if not review:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Review not found"
+        )
+
+    return dict(review)
 
 async def delete_review(
     db: AsyncSession,
-    review_id: int,
-    user_id: int
+    review_id: int
 ) -> None:
+    """Callers authorize through ownership_service."""
     review = await get_review_by_id(db, review_id)
     
-    if review.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete this review"
-        )
-    
     await db.delete(review)
+    await rice_summary_service.apply_summary_delta(
+        db,
+        review.rice_id,
+        reviews_delta=-1,
+        rating_delta=-review.rating,
+        rating_counts_delta={review.rating: -1}
+    )
+    card_cache.invalidate_on_commit(db, card_cache.rice_tag(review.rice_id), card_cache.sort_tag("top_rated"))
+    detail_cache.invalidate_on_commit(db, review.rice_id)
+    ownership_service.invalidate_on_commit(db, "review", review_id)
     await db.commit()
 
 async def get_review_stats(
     db: AsyncSession,
     rice_id: int
 ) -> dict:
-    stats = await db.execute(
-        select(
-            func.avg(Review.rating).label('avg_rating'),
-            func.count(Review.id).label('total_reviews')
-        ).where(Review.rice_id == rice_id)
+    """
+    Read from the summary columns on rices - one primary-key lookup. Ids without
+    a rice row, and rows whose histogram does not add up to reviews_count (never
+    backfilled, or drifted), are counted from the reviews instead; the latter
+    are repaired on the primary so later reads take the fast path again.
+    """
+    rice = (await db.execute(
+        select(Rice.reviews_count, Rice.avg_rating.label("avg_rating"), *(
+            Rice.rating_count_column(rating) for rating in RATING_VALUES
+        ))
+        .where(Rice.id == rice_id)
+    )).one_or_none()
+
+    if rice is None:
+        return await get_review_stats_from_reviews(db, rice_id)
+
+    reviews_count, avg_rating, *counts = rice
+    if any(count is None for count in counts) or sum(counts) != reviews_count:
+        stats = await get_review_stats_from_reviews(db, rice_id)
+        async with AsyncSessionLocal() as primary:
+            await rice_summary_service.rebuild_rating_histograms(primary, rice_id=rice_id)
+        return stats
+
+    return {
+        "avg_rating": avg_rating,
+        "total_reviews": reviews_count,
+        "rating_distribution": dict(zip(RATING_VALUES, counts))
+    }
+
+async def get_review_stats_from_reviews(
+    db: AsyncSession,
+    rice_id: int
+) -> dict:
+    """Same figures computed from the review rows in a single GROUP BY."""
+    result = await db.execute(
+        select(Review.rating, func.count(Review.id))
+        .where(Review.rice_id == rice_id)
+        .group_by(Review.rating)
     )
-    result = stats.one()
-    
-    distribution = {}
-    for rating in range(1, 6):
-        count = await db.scalar(
-            select(func.count(Review.id))
-            .where(
-                and_(
-                    Review.rice_id == rice_id,
-                    Review.rating == rating
-                )
-            )
-        )
-        distribution[rating] = count or 0
-    
+    distribution = {rating: 0 for rating in RATING_VALUES}
+    distribution.update(dict(result.all()))
+
+    total_reviews = sum(distribution.values())
+    rating_sum = sum(rating * count for rating, count in distribution.items())
     return {
-        "avg_rating": float(result.avg_rating) if result.avg_rating else None,
-        "total_reviews": result.total_reviews or 0,
+        "avg_rating": rating_sum / total_reviews if total_reviews else None,
+        "total_reviews": total_reviews,
         "rating_distribution": distribution
-    }
\ No newline at end of file
+    }
@@ -1,43 +1,53 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, insert, func, exists, tuple_, literal_column, JSON
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
-from models.rice import Rice, Theme, Review, ThemeMedia
-from schemas.rice import RiceCreate, RiceUpdate 
-from services import theme_service
+from models.rice import Rice, Theme, ThemeMedia
+from schemas.rice import RiceCreate, RiceUpdate, RiceOut
+from services import theme_service, rice_summary_service, search_service, count_service, card_cache, detail_cache, ownership_service, unique_viewer_service
+from services.counter_buffer import counter_buffer
+from services.pagination import encode_cursor, decode_cursor
+from config.settings import settings
 from typing import Optional
 
 async def create_rice(
     db: AsyncSession,
     user_id: int,
     rice_data: RiceCreate
-) -> Rice:
-    new_rice = Rice(
-        user_id=user_id,
-        name=rice_data.name,
-        dotfile_url=str(rice_data.dotfile_url),
-    )
-    db.add(new_rice)
-    await db.flush()  
-
-    for theme_data in rice_data.themes:
-        await theme_service.create_theme(
-            db=db,
-            rice_id=new_rice.id,
-            theme_data=theme_data
+) -> dict:
+    """
+    Insert the rice, its themes and their media with one INSERT ... RETURNING
+    per table and build the RiceOut payload from the returned rows.
+    """
+    result = await db.execute(
+        insert(Rice)
+        .values(
+            user_id=user_id,
+            name=rice_data.name,
+            dotfile_url=str(rice_data.dotfile_url)
         )
+        .returning(
+            Rice.id,
+            Rice.user_id,
+            Rice.name,
+            Rice.dotfile_url,
+            Rice.views,
+            Rice.dotfile_clicks,
+            Rice.date_added,
+            Rice.date_updated
+        )
+    )
+    new_rice = dict(result.mappings().one())
+
+    new_rice["themes"] = await theme_service.create_themes_bulk(db, new_rice["id"], rice_data.themes)
     
+    card_cache.invalidate_on_commit(db, card_cache.TAG_ALL)
+    count_service.invalidate_on_commit(db)
     await db.commit()
-    await db.refresh(new_rice)
 
-    result = await db.execute(
-        select(Rice)
-        .options(
-            selectinload(Rice.themes).selectinload(Theme.media)
-        )
-        .where(Rice.id == new_rice.id)
-    )
-    return result.scalar_one()
+    new_rice.update(avg_rating=None, reviews_count=0)
+    return new_rice
 
 async def get_rice_by_id(
     db: AsyncSession,
@@ -45,8 +55,7 @@ async def get_rice_by_id(
     include_deleted: bool = False
 ) -> Rice:
     query = select(Rice).options(
-        selectinload(Rice.themes).selectinload(Theme.media),
-        selectinload(Rice.reviews)
+        selectinload(Rice.themes).selectinload(Theme.media)
     ).where(Rice.id == rice_id)
 
     if not include_deleted:
@@ -61,58 +70,145 @@ async def get_rice_by_id(
             detail="Rice not found"
         )
 
-    await db.refresh(rice)
     return rice
 
 
+async def get_rice_state(
+    db: AsyncSession,
+    rice_id: int
+) -> tuple[tuple, int, int]:
+    """
+    (validator, views, dotfile_clicks) of a live rice. The validator is a cheap
+    stamp of everything in the detail payload except the live counters.
+    """
+    from models.user import Profile
+
+    result = await db.execute(
+        select(Rice.content_version, Profile.username, Profile.avatar_url, Rice.views, Rice.dotfile_clicks)
+        .outerjoin(Profile, Profile.id == Rice.user_id)
+        .where(Rice.id == rice_id, Rice.is_deleted == False)
+    )
+    row = result.one_or_none()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Rice not found"
+        )
+
+    content_version, username, avatar_url, views, dotfile_clicks = row
+    return (content_version, username, avatar_url), views, dotfile_clicks
+
+async def get_cached_rice_details(
+    db: AsyncSession,
+    rice_id: int,
+    validator: tuple,
+    views: int,
+    dotfile_clicks: int
+) -> dict:
+    """Detail payload of a live rice from the detail cache, with current counters overlaid."""
+    details = detail_cache.detail_cache.get(rice_id, validator)
+    if details is None:
+        details = await get_rice_with_details(db, rice_id)
+        detail_cache.detail_cache.set(rice_id, validator, RiceOut.model_validate(details).model_dump_json().encode())
+
+    pending_views, pending_clicks = counter_buffer.pending(rice_id)
+    details["views"] = views + pending_views
+    details["dotfile_clicks"] = dotfile_clicks + pending_clicks
+    return details
+
+def _themes_json():
+    """
+    Correlated subquery rendering a rice's themes, each with its media, as one
+    JSON array in display order - the shape of RiceOut.themes.
+    """
+    media = (
+        select(func.coalesce(
+            func.json_agg(aggregate_order_by(
+                func.json_build_object(
+                    "id", ThemeMedia.id,
+                    "theme_id", ThemeMedia.theme_id,
+                    "url", ThemeMedia.url,
+                    "media_type", ThemeMedia.media_type,
+                    "display_order", ThemeMedia.display_order,
+                    "thumbnail_url", ThemeMedia.thumbnail_url,
+                    "date_added", ThemeMedia.date_added
+                ),
+                ThemeMedia.display_order, ThemeMedia.id
+            )),
+            literal_column("'[]'::json"),
+            type_=JSON
+        ))
+        .where(ThemeMedia.theme_id == Theme.id)
+        .scalar_subquery()
+    )
+
+    return (
+        select(func.coalesce(
+            func.json_agg(aggregate_order_by(
+                func.json_build_object(
+                    "id", Theme.id,
+                    "rice_id", Theme.rice_id,
+                    "name", Theme.name,
+                    "description", Theme.description,
+                    "tags", Theme.tags,
+                    "display_order", Theme.display_order,
+                    "date_added", Theme.date_added,
+                    "media", media
+                ),
+                Theme.display_order, Theme.id
+            )),
+            literal_column("'[]'::json"),
+            type_=JSON
+        ))
+        .where(Theme.rice_id == Rice.id)
+        .scalar_subquery()
+    )
+
 async def get_rice_with_details(
     db: AsyncSession,
     rice_id: int,
     include_deleted: bool = False
 ) -> dict:
-    from models.user import User, Profile
-    
-    query = select(Rice).options(
-        selectinload(Rice.themes).selectinload(Theme.media),
-        selectinload(Rice.reviews),
-        selectinload(Rice.user).selectinload(User.profiles)
-    ).where(Rice.id == rice_id)
+    """Whole RiceOut payload - poster, review aggregates and nested themes - in one statement."""
+    from models.user import Profile
+
+    query = (
+        select(
+            Rice.id,
+            Rice.user_id,
+            Rice.name,
+            Rice.dotfile_url,
+            Rice.views,
+            Rice.dotfile_clicks,
+            Rice.date_added,
+            Rice.date_updated,
+            Rice.avg_rating.label("avg_rating"),
+            Rice.reviews_count,
+            Profile.username.label("poster_name"),
+            Profile.avatar_url.label("poster_avatar"),
+            _themes_json().label("themes")
+        )
+        .outerjoin(Profile, Profile.id == Rice.user_id)
+        .where(Rice.id == rice_id)
+    )
 
     if not include_deleted:
         query = query.where(Rice.is_deleted == False)
 
-    result = await db.execute(query)
-    rice = result.scalar_one_or_none()
+    row = (await db.execute(query)).mappings().one_or_none()
 
-    if not rice:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Rice not found"
         )
 
-    # Get poster info from user profile
-    poster_name = None
-    poster_avatar = None
-    if rice.user and rice.user.profiles:
-        poster_name = rice.user.profiles.username
-        poster_avatar = rice.user.profiles.avatar_url
-
-    # Return as dict with all computed properties
-    return {
-        "id": rice.id,
-        "user_id": rice.user_id,
-        "name": rice.name,
-        "dotfile_url": rice.dotfile_url,
-        "views": rice.views,
-        "dotfile_clicks": rice.dotfile_clicks,
-        "date_added": rice.date_added,
-        "date_updated": rice.date_updated,
-        "themes": rice.themes,
-        "avg_rating": rice.avg_rating,
-        "reviews_count": rice.reviews_count,
-        "poster_name": poster_name,
-        "poster_avatar": poster_avatar
-    }
+    details = dict(row)
+    pending_views, pending_clicks = counter_buffer.pending(rice_id)
+    details["views"] += pending_views
+    details["dotfile_clicks"] += pending_clicks
+    return details
 
 
 async def get_rice_by_user(
@@ -121,18 +217,19 @@ async def get_rice_by_user(
     skip: int = 0,
     limit: int = 20,
     include_deleted: bool = False
-) -> tuple[list[Rice], int]:
+) -> tuple[list[Rice], int, bool]:
     base_query = select(Rice).where(Rice.user_id == user_id)
     if not include_deleted:
         base_query = base_query.where(Rice.is_deleted == False)
 
     # Count total
-    total_count = await db.scalar(select(func.count()).select_from(base_query.subquery()))
+    total_count, total_is_exact = await count_service.count(
+        db,
+        base_query,
+        cache_key=("user_rices", user_id, include_deleted)
+    )
 
-    query = select(Rice).options(
-        selectinload(Rice.themes).selectinload(Theme.media),
-        selectinload(Rice.reviews)
-    ).where(Rice.user_id == user_id)
+    query = select(Rice).where(Rice.user_id == user_id)
 
     if not include_deleted:
         query = query.where(Rice.is_deleted == False)
@@ -141,7 +238,38 @@ async def get_rice_by_user(
     result = await db.execute(query)
     items = result.scalars().all()
     
-    return items, total_count or 0
+    return items, total_count, total_is_exact
+
+def _search_clause(q: str):
+    ts_query = search_service.build_ts_query(q)
+    if ts_query is not None:
+        return search_service.match_clause(ts_query)
+
+    # Nothing tokenizable (punctuation only): fall back to substring matching
+    search_pattern = f"%{q}%"
+    return Rice.name.ilike(search_pattern) | exists().where(
+        Theme.rice_id == Rice.id,
+        Theme.tags.ilike(search_pattern)
+    )
+
+def _sort_key(sort_by: str, sort_order: str, q: Optional[str] = None):
+    if sort_by == "relevance":
+        ts_query = search_service.build_ts_query(q) if q else None
+        if ts_query is not None:
+            return search_service.rank_expr(ts_query)
+        return Rice.date_added
+    if sort_by == "popular":
+        return Rice.views
+    if sort_by == "top_rated":
+        return Rice.rating_score
+    if sort_by == "trending":
+        return Rice.trending_score
+    return Rice.date_added
+
+def _sort_clauses(sort_key, ascending: bool) -> list:
+    if ascending:
+        return [sort_key.asc(), Rice.id.asc()]
+    return [sort_key.desc(), Rice.id.desc()]
 
 async def get_all_rice(
     db: AsyncSession,
@@ -150,51 +278,70 @@ async def get_all_rice(
     sort_by: str = "recent",
     sort_order: str = "desc",
     q: Optional[str] = None
-) -> tuple[list[Rice], int]:
-    base_query = select(Rice).where(Rice.is_deleted == False)
+) -> tuple[list[Rice], int, bool]:
+    query = select(Rice).where(Rice.is_deleted == False)
     
     if q:
-        search_pattern = f"%{q}%"
-        base_query = base_query.join(Theme).where(
-            (Rice.name.ilike(search_pattern) | Theme.tags.ilike(search_pattern))
-        ).group_by(Rice.id)
+        query = query.where(_search_clause(q))
     
     # Count total
-    total_count = await db.scalar(select(func.count()).select_from(base_query.subquery()))
-
-    query = select(Rice).options(
-        selectinload(Rice.themes).selectinload(Theme.media),
-        selectinload(Rice.reviews)
-    ).where(Rice.is_deleted == False)
-    
-    if q:
-        search_pattern = f"%{q}%"
-        query = query.join(Theme).where(
-            (Rice.name.ilike(search_pattern) | Theme.tags.ilike(search_pattern))
-        ).group_by(Rice.id)
-
-    is_asc = sort_order == "asc"
-
-    if sort_by == "popular":
-        query = query.order_by(Rice.views.asc() if is_asc else Rice.views.desc())
-    elif sort_by == "top_rated":
-        avg_rating_col = func.avg(Review.rating)
-        order_clause = avg_rating_col.asc() if is_asc else avg_rating_col.desc()
-        query = query.outerjoin(Review)
-        if not q:
-            query = query.group_by(Rice.id)
-        query = query.order_by(order_clause.nullslast(), Rice.date_added.desc())
-    elif sort_by == "recent":
-        query = query.order_by(Rice.date_added.asc() if is_asc else Rice.date_added.desc())
-    else:
-        query = query.order_by(Rice.date_added.asc() if is_asc else Rice.date_added.desc())
+    total_count, total_is_exact = await count_service.count(
+        db,
+        query,
+        cache_key=("rices", q or None),
+        unfiltered_table=None if q else "rices"
+    )
 
+    query = query.order_by(*_sort_clauses(_sort_key(sort_by, sort_order, q), sort_order == "asc"))
     query = query.offset(skip).limit(limit)
 
     result = await db.execute(query)
     items = result.scalars().all()
-    return items, total_count or 0
+    return items, total_count, total_is_exact
+
+
+def _card_columns() -> tuple:
+    """RiceCardOut fields, straight from the summary columns; needs the Profile outer join."""
+    from models.user import Profile
+
+    return (
+        Rice.id,
+        Rice.name,
+        Rice.views,
+        Rice.date_added,
+        Rice.date_updated,
+        Rice.themes_count,
+        Rice.reviews_count,
+        Rice.avg_rating.label("avg_rating"),
+        Rice.preview_image_url.label("preview_image"),
+        Profile.username.label("poster_name")
+    )
 
+async def get_rice_cards_by_ids(
+    db: AsyncSession,
+    rice_ids: list[int]
+) -> tuple[list[dict], list[int]]:
+    """
+    Cards for an arbitrary set of rices in one query. Returns (cards in the
+    order of `rice_ids`, ids that are missing or deleted); duplicates are
+    returned once.
+    """
+    from models.user import Profile
+
+    rice_ids = list(dict.fromkeys(rice_ids))
+    if not rice_ids:
+        return [], []
+
+    result = await db.execute(
+        select(*_card_columns())
+        .outerjoin(Profile, Profile.id == Rice.user_id)
+        .where(Rice.id.in_(rice_ids), Rice.is_deleted == False)
+    )
+    cards_by_id = {row["id"]: dict(row) for row in result.mappings().all()}
+
+    cards = [cards_by_id[rice_id] for rice_id in rice_ids if rice_id in cards_by_id]
+    missing = [rice_id for rice_id in rice_ids if rice_id not in cards_by_id]
+    return cards, missing
 
 async def get_all_rice_cards(
     db: AsyncSession,
@@ -202,98 +349,109 @@ async def get_all_rice_cards(
     limit: int = 20,
     sort_by: str = "recent",
     sort_order: str = "desc",
-    q: Optional[str] = None
-) -> tuple[list[dict], int]:
+    q: Optional[str] = None,
+    cursor: Optional[str] = None
+) -> tuple[list[dict], int, bool, str | None, str | None]:
     """
     Optimized query for homepage rice cards - returns only essential data.
-    Returns dicts with pre-computed values instead of ORM objects.
+    Reads the denormalized summary columns on rices, so a page is one narrow
+    query with no relationship loading.
+
+    With `cursor` the page is located by keyset on (sort key, id) instead of
+    OFFSET. Returns (cards, total, total_is_exact, next_cursor, prev_cursor);
+    cursors are returned in offset mode too so clients can switch over after
+    any page.
     """
-    from models.user import User, Profile
+    from models.user import Profile
     
-    base_query = select(Rice).where(Rice.is_deleted == False)
+    base_query = select(Rice.id).where(Rice.is_deleted == False)
     
     if q:
-        search_pattern = f"%{q}%"
-        base_query = base_query.join(Theme).where(
-            (Rice.name.ilike(search_pattern) | Theme.tags.ilike(search_pattern))
-        ).group_by(Rice.id)
+        base_query = base_query.where(_search_clause(q))
     
-    total_count = await db.scalar(select(func.count()).select_from(base_query.subquery()))
+    total_count, total_is_exact = await count_service.count(
+        db,
+        base_query,
+        cache_key=("rices", q or None),
+        unfiltered_table=None if q else "rices"
+    )
 
-    # Optimized query - only load what's needed for cards
-    query = select(Rice).options(
-        selectinload(Rice.themes).selectinload(Theme.media),
-        selectinload(Rice.reviews),
-        selectinload(Rice.user).selectinload(User.profiles)
-    ).where(Rice.is_deleted == False)
+    sort_key = _sort_key(sort_by, sort_order, q)
+    cursor_kind = f"rices:{sort_by}:{sort_order}"
+    if sort_by == "relevance":
+        # Rank values only mean something for the query that produced them
+        cursor_kind += f":{q or ''}"
+
+    query = (
+        select(*_card_columns(), sort_key.label("sort_key"))
+        .outerjoin(Profile, Profile.id == Rice.user_id)
+        .where(Rice.is_deleted == False)
+    )
     
     if q:
-        search_pattern = f"%{q}%"
-        query = query.join(Theme).where(
-            (Rice.name.ilike(search_pattern) | Theme.tags.ilike(search_pattern))
-        ).group_by(Rice.id)
+        query = query.where(_search_clause(q))
 
     is_asc = sort_order == "asc"
-
-    if sort_by == "popular":
-        query = query.order_by(Rice.views.asc() if is_asc else Rice.views.desc())
-    elif sort_by == "top_rated":
-        avg_rating_col = func.avg(Review.rating)
-        order_clause = avg_rating_col.asc() if is_asc else avg_rating_col.desc()
-        query = query.outerjoin(Review, and_(Review.rice_id == Rice.id))
-        if not q:
-            query = query.group_by(Rice.id)
-        query = query.order_by(order_clause.nullslast(), Rice.date_added.desc())
-    elif sort_by == "recent":
-        query = query.order_by(Rice.date_added.asc() if is_asc else Rice.date_added.desc())
+    backwards = False
+
+    if cursor:
+        key, last_id, direction = decode_cursor(cursor, cursor_kind)
+        backwards = direction == "prev"
+        position = tuple_(sort_key, Rice.id)
+        # Walking forward in an ascending listing (or backwards in a descending one) means larger keys
+        if is_asc != backwards:
+            query = query.where(position > tuple_(key, last_id))
+        else:
+            query = query.where(position < tuple_(key, last_id))
+        # Walk backwards by flipping the order, then restore it after fetching
+        query = query.order_by(*_sort_clauses(sort_key, is_asc != backwards)).limit(limit + 1)
     else:
-        query = query.order_by(Rice.date_added.asc() if is_asc else Rice.date_added.desc())
-
-    query = query.offset(skip).limit(limit)
+        query = query.order_by(*_sort_clauses(sort_key, is_asc))
+        query = query.offset(skip).limit(limit + 1)
 
     result = await db.execute(query)
-    items = result.scalars().all()
-    
-    # Transform to minimal card data
-    cards = []
-    for rice in items:
-        poster_name = None
-        if rice.user and rice.user.profiles:
-            poster_name = rice.user.profiles.username
-        
-        cards.append({
-            "id": rice.id,
-            "name": rice.name,
-            "views": rice.views,
-            "date_added": rice.date_added,
-            "date_updated": rice.date_updated,
-            "themes_count": rice.themes_count,
-            "reviews_count": rice.reviews_count,
-            "avg_rating": rice.avg_rating,
-            "preview_image": rice.preview_image,
-            "poster_name": poster_name
-        })
+    rows = [dict(row) for row in result.mappings().all()]
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, cursor is not None or skip > 0
+
+    next_cursor = None
+    prev_cursor = None
+    if rows and has_next:
+        last = rows[-1]
+        next_cursor = encode_cursor(cursor_kind, last["sort_key"], last["id"], "next")
+    if rows and has_prev:
+        first = rows[0]
+        prev_cursor = encode_cursor(cursor_kind, first["sort_key"], first["id"], "prev")
+
+    for row in rows:
+        row.pop("sort_key")
     
-    return cards, total_count or 0
+    return rows, total_count, total_is_exact, next_cursor, prev_cursor
 
 
 async def update_rice(
     db: AsyncSession,
     rice_id: int,
-    user_id: int,
     rice_data: RiceUpdate
 ) -> Rice:
+    """Callers authorize through ownership_service."""
     rice = await get_rice_by_id(db, rice_id)
-    if rice.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this rice"
-        )
 
     if rice_data.name is not None:
         rice.name = rice_data.name
+        await rice_summary_service.apply_summary_delta(db, rice.id, refresh_search=True)
+        card_cache.invalidate_on_commit(db, card_cache.rice_tag(rice.id), card_cache.TAG_SEARCH)
+        count_service.invalidate_on_commit(db)
     if rice_data.dotfile_url is not None:
         rice.dotfile_url = str(rice_data.dotfile_url)
+        rice.content_version = Rice.content_version + 1
+    detail_cache.invalidate_on_commit(db, rice.id)
 
     await db.commit()
     await db.refresh(rice)
@@ -302,62 +460,64 @@ async def update_rice(
 async def delete_rice(
     db: AsyncSession,
     rice_id: int,
-    user_id: int,
     soft_delete: bool = True
 ) -> None:
+    """Callers authorize through ownership_service."""
     rice = await get_rice_by_id(db, rice_id)
-
-    if rice.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete this rice"
-        )
     
+    card_cache.invalidate_on_commit(db, card_cache.TAG_ALL)
+    detail_cache.invalidate_on_commit(db, rice.id)
+    count_service.invalidate_on_commit(db)
+
     if soft_delete:
         rice.is_deleted = True
         await db.commit()
     else:
         await db.delete(rice)
+        ownership_service.invalidate_on_commit(db, "rice", rice_id)
         await db.commit()
 
-async def increment_rice_views(
-    db: AsyncSession,
-    rice_id: int
-) -> None:
-    rice = await get_rice_by_id(db, rice_id)
-    rice.views += 1
-    await db.commit()
+def increment_rice_views(rice_id: int) -> None:
+    """Buffered; written in batches by counter_buffer. Callers check the rice exists."""
+    counter_buffer.add(rice_id, views=1)
 
 async def increment_dotfile_clicks(
     db: AsyncSession,
     rice_id: int
 ) -> None:
-    rice = await get_rice_by_id(db, rice_id)
-    rice.dotfile_clicks += 1
-    await db.commit()
+    exists_id = await db.scalar(
+        select(Rice.id).where(Rice.id == rice_id, Rice.is_deleted == False)
+    )
+    if not exists_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Rice not found"
+        )
+    counter_buffer.add(rice_id, dotfile_clicks=1)
 
 async def get_rice_stats(
     db: AsyncSession,
     rice_id: int
 ) -> dict:
-    rice = await get_rice_by_id(db, rice_id)
-
-    theme_count = await db.scalar(
-        select(func.count(Theme.id)).where(Theme.rice_id == rice_id)
+    rice = await db.scalar(
+        select(Rice).where(Rice.id == rice_id, Rice.is_deleted == False)
     )
 
-    review_stats = await db.execute(
-        select(
-            func.avg(Review.rating).label("avg_rating"),
-            func.count(Review.id).label("review_count")
-        ).where(Review.rice_id == rice_id)
-    )
-    stats = review_stats.one()
+    if not rice:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Rice not found"
+        )
+
+    pending_views, pending_clicks = counter_buffer.pending(rice_id)
 
     return {
-        "views": rice.views,
-        "dotfile_clicks": rice.dotfile_clicks,
-        "theme_count": theme_count or 0,
-        "avg_rating": float(stats.avg_rating) if stats.avg_rating else None,
-        "review_count": stats.review_count or 0
+        "views": rice.views + pending_views,
+        "unique_viewers": await unique_viewer_service.count_unique_viewers(db, rice_id),
+        "unique_viewers_window_days": settings.UNIQUE_VIEWERS_WINDOW_DAYS,
+        "dotfile_clicks": rice.dotfile_clicks + pending_clicks,
+        "theme_count": rice.themes_count,
+        "avg_rating": rice.avg_rating,
+        "review_count": rice.reviews_count,
+        "rating_distribution": rice.rating_distribution
     }
\ No newline at end of file
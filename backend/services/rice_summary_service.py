@@ -0,0 +1,164 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, or_
+from models.rice import Rice, Theme, ThemeMedia, Review, MediaType, RATING_VALUES
+from services.search_service import search_vector_expr
+
+def _preview_image_subquery(rice_id_col):
+    # First image of the first theme, thumbnail preferred (same rule the cards always used)
+    return (
+        select(func.coalesce(ThemeMedia.thumbnail_url, ThemeMedia.url))
+        .join(Theme, Theme.id == ThemeMedia.theme_id)
+        .where(
+            Theme.rice_id == rice_id_col,
+            ThemeMedia.media_type == MediaType.IMAGE
+        )
+        .order_by(Theme.display_order, Theme.id, ThemeMedia.display_order, ThemeMedia.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+async def apply_summary_delta(
+    db: AsyncSession,
+    rice_id: int,
+    themes_delta: int = 0,
+    reviews_delta: int = 0,
+    rating_delta: int = 0,
+    rating_counts_delta: dict[int, int] | None = None,
+    refresh_preview: bool = False,
+    refresh_search: bool = False
+) -> None:
+    """
+    Adjust the denormalized card columns of one rice in a single UPDATE.
+    `rating_counts_delta` maps star values to histogram changes, e.g. {2: -1, 4: 1}.
+    Runs inside the caller's transaction; the caller commits.
+    """
+    values = {}
+    for rating, delta in (rating_counts_delta or {}).items():
+        if delta:
+            column = Rice.rating_count_column(rating)
+            values[column.key] = column + delta
+    if themes_delta:
+        values["themes_count"] = Rice.themes_count + themes_delta
+    if reviews_delta:
+        values["reviews_count"] = Rice.reviews_count + reviews_delta
+    if rating_delta:
+        values["rating_sum"] = Rice.rating_sum + rating_delta
+    if reviews_delta or rating_delta:
+        values["ranking_dirty"] = True
+    if refresh_preview:
+        values["preview_image_url"] = _preview_image_subquery(Rice.id)
+    if refresh_search:
+        values["search_vector"] = search_vector_expr(Rice.id, Rice.name)
+
+    if not values:
+        return
+    values["content_version"] = Rice.content_version + 1
+
+    await db.execute(
+        update(Rice)
+        .where(Rice.id == rice_id)
+        .values(**values)
+    )
+
+async def refresh_preview_for_theme(
+    db: AsyncSession,
+    theme_id: int
+) -> int | None:
+    """Recompute the preview image of the rice owning `theme_id`; returns that rice's id."""
+    return await db.scalar(
+        update(Rice)
+        .where(Rice.id == select(Theme.rice_id).where(Theme.id == theme_id).scalar_subquery())
+        .values(
+            preview_image_url=_preview_image_subquery(Rice.id),
+            content_version=Rice.content_version + 1
+        )
+        .returning(Rice.id)
+    )
+
+async def reconcile_summaries(
+    db: AsyncSession,
+    rice_id: int | None = None
+) -> int:
+    """
+    Recompute every summary column from the source tables and fix rows that drifted.
+    Returns the number of rows that were repaired.
+    """
+    themes_count = (
+        select(func.count(Theme.id))
+        .where(Theme.rice_id == Rice.id)
+        .scalar_subquery()
+    )
+    reviews_count = (
+        select(func.count(Review.id))
+        .where(Review.rice_id == Rice.id)
+        .scalar_subquery()
+    )
+    rating_sum = (
+        select(func.coalesce(func.sum(Review.rating), 0))
+        .where(Review.rice_id == Rice.id)
+        .scalar_subquery()
+    )
+    preview_image_url = _preview_image_subquery(Rice.id)
+    search_vector = search_vector_expr(Rice.id, Rice.name)
+
+    stmt = (
+        update(Rice)
+        .where(
+            (Rice.themes_count != themes_count)
+            | (Rice.reviews_count != reviews_count)
+            | (Rice.rating_sum != rating_sum)
+            | Rice.preview_image_url.is_distinct_from(preview_image_url)
+            | Rice.search_vector.is_distinct_from(search_vector)
+        )
+        .values(
+            themes_count=themes_count,
+            reviews_count=reviews_count,
+            rating_sum=rating_sum,
+            preview_image_url=preview_image_url,
+            search_vector=search_vector
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if rice_id is not None:
+        stmt = stmt.where(Rice.id == rice_id)
+
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount or 0
+
+def rating_histogram_query():
+    """Per-rice star counts in one GROUP BY pass over reviews, zeros for rices without reviews."""
+    return (
+        select(
+            Rice.id.label("rice_id"),
+            *(
+                func.count(Review.id).filter(Review.rating == rating).label(f"rating_{rating}_count")
+                for rating in RATING_VALUES
+            )
+        )
+        .outerjoin(Review, Review.rice_id == Rice.id)
+        .group_by(Rice.id)
+    )
+
+async def rebuild_rating_histograms(
+    db: AsyncSession,
+    rice_id: int | None = None
+) -> int:
+    """Recount the review histogram columns and fix rows that drifted; returns the number repaired."""
+    histogram = rating_histogram_query()
+    if rice_id is not None:
+        histogram = histogram.where(Rice.id == rice_id)
+    histogram = histogram.subquery()
+
+    columns = [f"rating_{rating}_count" for rating in RATING_VALUES]
+    stmt = (
+        update(Rice)
+        .where(Rice.id == histogram.c.rice_id)
+        .where(or_(*(getattr(Rice, name) != histogram.c[name] for name in columns)))
+        .values({name: histogram.c[name] for name in columns})
+        .execution_options(synchronize_session=False)
+    )
+
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount or 0
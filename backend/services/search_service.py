@@ -0,0 +1,48 @@
+from sqlalchemy import select, func, literal_column, literal
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from models.rice import Rice, Theme
+import re
+
+# Unstemmed parsing: rice names and tags are tool names (i3, hyprland, polybar), not English prose
+TS_CONFIG = literal_column("'simple'::regconfig")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def _weighted(text_expr, weight: str):
+    return func.setweight(
+        func.to_tsvector(TS_CONFIG, func.coalesce(text_expr, "")),
+        literal_column(f"'{weight}'"),
+        type_=TSVECTOR
+    )
+
+def search_vector_expr(rice_id_col, name_col):
+    """
+    Document for one rice: name (A), theme names and tags (B), theme descriptions (C).
+    Evaluated in SQL so it can be used in UPDATE ... SET search_vector = ...
+    """
+    themes_document = (
+        select(
+            _weighted(func.string_agg(Theme.name, literal(" ")), "B")
+            .op("||", return_type=TSVECTOR)(_weighted(func.string_agg(Theme.tags, literal(" ")), "B"))
+            .op("||", return_type=TSVECTOR)(_weighted(func.string_agg(Theme.description, literal(" ")), "C"))
+        )
+        .where(Theme.rice_id == rice_id_col)
+        .scalar_subquery()
+    )
+    return _weighted(name_col, "A").op("||", return_type=TSVECTOR)(themes_document)
+
+def build_ts_query(q: str):
+    """
+    Turn free text into a prefix-matching tsquery ("hypr nor" -> 'hypr:* & nor:*').
+    Returns None when the text has no searchable words.
+    """
+    tokens = [token.lower() for token in _TOKEN_RE.findall(q)]
+    if not tokens:
+        return None
+    return func.to_tsquery(TS_CONFIG, " & ".join(f"{token}:*" for token in tokens))
+
+def match_clause(ts_query):
+    return Rice.search_vector.bool_op("@@")(ts_query)
+
+def rank_expr(ts_query):
+    return func.ts_rank_cd(Rice.search_vector, ts_query)
@@ -0,0 +1,113 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, literal, union_all, Integer
+from models.rice import Rice, Theme
+from models.user import Profile
+from utils.cache import TTLCache
+from config.settings import settings
+
+# Hot prefixes ("hy", "hypr", "nord") are asked for constantly while people type
+_suggest_cache = TTLCache(
+    maxsize=settings.SUGGEST_CACHE_SIZE,
+    ttl=settings.SUGGEST_CACHE_TTL_SECONDS
+)
+
+# Below this length trigram indexes can't help, so only anchored prefixes are matched
+_TRIGRAM_MIN_LENGTH = 3
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _pattern(q: str) -> str:
+    escaped = _escape_like(q)
+    if len(q) < _TRIGRAM_MIN_LENGTH:
+        return f"{escaped}%"
+    return f"%{escaped}%"
+
+def _split_tags(tags: str, q: str) -> list[str]:
+    return [
+        tag.strip()
+        for tag in tags.split(",")
+        if q in tag.strip().lower()
+    ]
+
+async def suggest(
+    db: AsyncSession,
+    q: str,
+    limit: int = 8
+) -> list[dict]:
+    """
+    Typeahead suggestions for rice names, tags and poster usernames.
+    Returns plain {kind, id, label} dicts; tags carry no id.
+    """
+    q = q.strip().lower()
+    if not q:
+        return []
+
+    cache_key = (q, limit)
+    cached = _suggest_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    pattern = _pattern(q)
+
+    rices = (
+        select(
+            literal("rice").label("kind"),
+            Rice.id.label("id"),
+            Rice.name.label("label"),
+            func.similarity(Rice.name, q).label("score")
+        )
+        .where(Rice.is_deleted == False, Rice.name.ilike(pattern, escape="\\"))
+        .order_by(func.similarity(Rice.name, q).desc())
+        .limit(limit)
+    )
+    tags = (
+        select(
+            literal("tag").label("kind"),
+            literal(None, Integer).label("id"),
+            Theme.tags.label("label"),
+            func.similarity(Theme.tags, q).label("score")
+        )
+        .join(Rice, Rice.id == Theme.rice_id)
+        .where(Rice.is_deleted == False, Theme.tags.ilike(f"%{_escape_like(q)}%", escape="\\"))
+        .order_by(func.similarity(Theme.tags, q).desc())
+        .limit(limit * 4)
+    )
+    users = (
+        select(
+            literal("user").label("kind"),
+            Profile.id.label("id"),
+            Profile.username.label("label"),
+            func.similarity(Profile.username, q).label("score")
+        )
+        .where(Profile.username.ilike(pattern, escape="\\"))
+        .order_by(func.similarity(Profile.username, q).desc())
+        .limit(limit)
+    )
+
+    result = await db.execute(union_all(rices, tags, users))
+
+    suggestions: list[dict] = []
+    seen_tags: set[str] = set()
+    for row in result.all():
+        if row.kind != "tag":
+            suggestions.append({"kind": row.kind, "id": row.id, "label": row.label, "score": row.score})
+            continue
+        # tags is a comma-separated list; surface the individual tags that matched
+        for tag in _split_tags(row.label, q):
+            if tag.lower() in seen_tags:
+                continue
+            seen_tags.add(tag.lower())
+            suggestions.append({"kind": "tag", "id": None, "label": tag, "score": row.score})
+
+    suggestions.sort(key=lambda s: s["score"], reverse=True)
+    suggestions = [
+        {"kind": s["kind"], "id": s["id"], "label": s["label"]}
+        for s in suggestions[:limit]
+    ]
+
+    _suggest_cache.set(cache_key, suggestions)
+    return suggestions
+
+def cache_stats() -> dict:
+    return _suggest_cache.stats()
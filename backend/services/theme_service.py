@@ -1,42 +1,77 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, insert, update, values, column, func, and_, Integer
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 from models.rice import Theme, ThemeMedia, Rice
 from schemas.theme import ThemeCreate, ThemeUpdate
-from services import media_service
+from services import media_service, rice_summary_service, card_cache, detail_cache, ownership_service, count_service
  
-async def create_theme(
+_THEME_COLUMNS = (
+    Theme.id,
+    Theme.rice_id,
+    Theme.name,
+    Theme.description,
+    Theme.tags,
+    Theme.display_order,
+    Theme.date_added
+)
+
+async def create_themes_bulk(
     db: AsyncSession,
     rice_id: int,
-    theme_data: ThemeCreate
-) -> Theme:
-    new_theme = Theme(
-        rice_id=rice_id,
-        name=theme_data.name,
-        description=theme_data.description,
-        tags=theme_data.tags,
-        display_order=theme_data.display_order
+    themes_data: list[ThemeCreate]
+) -> list[dict]:
+    """
+    Insert themes and all of their media with one multi-row INSERT ... RETURNING
+    each, then update the rice summary once. Returns ThemeOut-shaped dicts in
+    input order; the caller commits.
+    """
+    result = await db.execute(
+        insert(Theme).returning(*_THEME_COLUMNS, sort_by_parameter_order=True),
+        [
+            {
+                "rice_id": rice_id,
+                "name": theme_data.name,
+                "description": theme_data.description,
+                "tags": theme_data.tags,
+                "display_order": theme_data.display_order
+            }
+            for theme_data in themes_data
+        ]
     )
-    db.add(new_theme)
-    await db.flush()
-
-    for media_data in theme_data.media:
-        await media_service.create_theme_media(
-            db=db,
-            theme_id=new_theme.id,
-            media_data=media_data
-        )
+    themes = [dict(row) for row in result.mappings().all()]
 
-    query = (
-        select(Theme)
-        .where(Theme.id == new_theme.id)
-        .options(selectinload(Theme.media)) 
+    media_rows = [
+        media_service.media_row(theme["id"], media_data)
+        for theme, theme_data in zip(themes, themes_data)
+        for media_data in theme_data.media
+    ]
+    media_by_theme = {theme["id"]: [] for theme in themes}
+    for media in await media_service.insert_media_rows(db, media_rows):
+        media_by_theme[media["theme_id"]].append(media)
+    for theme in themes:
+        theme["media"] = media_by_theme[theme["id"]]
+
+    await rice_summary_service.apply_summary_delta(
+        db,
+        rice_id,
+        themes_delta=len(themes),
+        refresh_preview=True,
+        refresh_search=True
     )
-    result = await db.execute(query)
-    created_theme = result.scalars().one()
+    card_cache.invalidate_on_commit(db, card_cache.rice_tag(rice_id), card_cache.TAG_SEARCH)
+    detail_cache.invalidate_on_commit(db, rice_id)
+    count_service.invalidate_on_commit(db)
 
-    return new_theme
+    return themes
+
+async def create_theme(
+    db: AsyncSession,
+    rice_id: int,
+    theme_data: ThemeCreate
+) -> dict:
+    themes = await create_themes_bulk(db, rice_id, [theme_data])
+    return themes[0]
 
 async def get_theme_by_id(
     db: AsyncSession,
@@ -69,20 +104,75 @@ async def get_themes_by_rice(
     )
     return result.scalars().all()
 
+async def reorder_themes(
+    db: AsyncSession,
+    rice_id: int,
+    user_id: int,
+    theme_order: list[dict]
+) -> list[Theme]:
+    """
+    Apply new display orders in one UPDATE ... FROM (VALUES ...), after a single
+    query that both authorizes `user_id` against the rice and checks that every
+    theme id belongs to it.
+    """
+    theme_ids = [item["theme_id"] for item in theme_order]
+    if len(set(theme_ids)) != len(theme_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each theme may appear only once"
+        )
+
+    row = (await db.execute(
+        select(Rice.user_id, func.count(Theme.id))
+        .select_from(Rice)
+        .outerjoin(Theme, and_(Theme.rice_id == Rice.id, Theme.id.in_(theme_ids)))
+        .where(Rice.id == rice_id, Rice.is_deleted == False)
+        .group_by(Rice.user_id)
+    )).one_or_none()
+    ownership_service.check_owner("rice", row.user_id if row else None, user_id)
+    _, found = row
+    if found != len(theme_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Some themes don't belong to rice {rice_id}"
+        )
+
+    if theme_order:
+        positions = values(
+            column("id", Integer),
+            column("display_order", Integer),
+            name="positions"
+        ).data([(item["theme_id"], item["display_order"]) for item in theme_order])
+        await db.execute(
+            update(Theme.__table__)
+            .where(Theme.id == positions.c.id)
+            .values(display_order=positions.c.display_order)
+        )
+
+    # The preview image is the first theme's, so it may change with the order
+    await rice_summary_service.apply_summary_delta(db, rice_id, refresh_preview=True)
+    card_cache.invalidate_on_commit(db, card_cache.rice_tag(rice_id))
+    detail_cache.invalidate_on_commit(db, rice_id)
+    await db.commit()
+
+    return await get_themes_by_rice(db, rice_id)
+
+async def get_themes_validator(
+    db: AsyncSession,
+    rice_id: int
+) -> int | None:
+    """Theme and media writes all bump the owning rice's content_version."""
+    return await db.scalar(
+        select(Rice.content_version).where(Rice.id == rice_id)
+    )
+
 async def update_theme(
     db: AsyncSession,
     theme_id: int,
-    user_id: int,
     theme_data: ThemeUpdate
 ) -> Theme:
+    """Callers authorize through ownership_service."""
     theme = await get_theme_by_id(db, theme_id)
-    rice = await db.get(Rice, theme.rice_id)
-    
-    if rice.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this theme"
-        )
 
     if theme_data.name is not None:
         theme.name = theme_data.name
@@ -92,6 +182,19 @@ async def update_theme(
         theme.tags = theme_data.tags
     if theme_data.display_order is not None:
         theme.display_order = theme_data.display_order
+
+    await rice_summary_service.apply_summary_delta(
+        db,
+        theme.rice_id,
+        refresh_preview=theme_data.display_order is not None,
+        refresh_search=any(
+            value is not None
+            for value in (theme_data.name, theme_data.description, theme_data.tags)
+        )
+    )
+    card_cache.invalidate_on_commit(db, card_cache.rice_tag(theme.rice_id), card_cache.TAG_SEARCH)
+    detail_cache.invalidate_on_commit(db, theme.rice_id)
+    count_service.invalidate_on_commit(db)
     
     await db.commit()
     await db.refresh(theme)
@@ -99,18 +202,11 @@ async def update_theme(
 
 async def delete_theme(
     db: AsyncSession,
-    theme_id: int,
-    user_id: int
+    theme_id: int
 ) -> None:
+    """Callers authorize through ownership_service."""
     theme = await get_theme_by_id(db, theme_id)
     
-    rice = await db.get(Rice, theme.rice_id)
-    if rice.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete this theme"
-        )
-    
     theme_count = await db.scalar(
         select(func.count(Theme.id)).where(Theme.rice_id == theme.rice_id)
     )
@@ -122,4 +218,15 @@ async def delete_theme(
         )
     
     await db.delete(theme)
+    await rice_summary_service.apply_summary_delta(
+        db,
+        theme.rice_id,
+        themes_delta=-1,
+        refresh_preview=True,
+        refresh_search=True
+    )
+    card_cache.invalidate_on_commit(db, card_cache.rice_tag(theme.rice_id), card_cache.TAG_SEARCH)
+    detail_cache.invalidate_on_commit(db, theme.rice_id)
+    count_service.invalidate_on_commit(db)
+    ownership_service.invalidate_on_commit(db, "theme", theme_id)
     await db.commit()
\ No newline at end of file
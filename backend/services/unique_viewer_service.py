@@ -0,0 +1,46 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from fastapi import Request
+from datetime import datetime, timezone, timedelta
+from models.rice import RiceUniqueViewers
+from config.settings import settings
+from services.counter_buffer import counter_buffer
+from services.hll import HyperLogLog
+import hashlib
+
+# Keyed so stored sketches can't be probed with guessed IPs or user ids
+_HASH_KEY = hashlib.blake2b(settings.SESSION_SECRET_KEY.encode(), digest_size=32).digest()
+
+def viewer_hash(user_id: int | None, request: Request) -> int:
+    """
+    64-bit identity of a viewer: the user id when signed in, otherwise a
+    fingerprint of client address and user agent. Never stored in the clear.
+    """
+    if user_id is not None:
+        identity = f"u:{user_id}"
+    else:
+        client_host = request.client.host if request.client else ""
+        identity = f"c:{client_host}|{request.headers.get('user-agent', '')}"
+    digest = hashlib.blake2b(identity.encode(), digest_size=8, key=_HASH_KEY).digest()
+    return int.from_bytes(digest, "big")
+
+def record_view(rice_id: int, user_id: int | None, request: Request) -> None:
+    counter_buffer.add_viewer(rice_id, viewer_hash(user_id, request))
+
+async def count_unique_viewers(
+    db: AsyncSession,
+    rice_id: int
+) -> int:
+    """Distinct viewers over the last UNIQUE_VIEWERS_WINDOW_DAYS days, including unflushed views."""
+    since = datetime.now(timezone.utc).date() - timedelta(days=settings.UNIQUE_VIEWERS_WINDOW_DAYS - 1)
+    sketches = await db.scalars(
+        select(RiceUniqueViewers.sketch)
+        .where(RiceUniqueViewers.rice_id == rice_id, RiceUniqueViewers.day >= since)
+    )
+
+    merged = HyperLogLog()
+    for sketch in sketches:
+        merged.merge(HyperLogLog.from_bytes(sketch))
+    for sketch in counter_buffer.pending_viewers(rice_id, since):
+        merged.merge(sketch)
+    return merged.count()
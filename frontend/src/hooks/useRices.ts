@@ -7,6 +7,7 @@ export const useRices = (page = 1, limit = 20, sortBy = 'popular', sortOrder = '
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [total, setTotal] = useState(0);
+  const [totalIsExact, setTotalIsExact] = useState(true);
   const [totalPages, setTotalPages] = useState(0);
 
   useEffect(() => {
@@ -17,6 +18,7 @@ export const useRices = (page = 1, limit = 20, sortBy = 'popular', sortOrder = '
 
         setRices(data.items);
         setTotal(data.total);
+        setTotalIsExact(data.total_is_exact ?? true);
         setTotalPages(data.total_pages);
       } catch (err) {
         setError('Failed to load rices');
@@ -30,5 +32,5 @@ export const useRices = (page = 1, limit = 20, sortBy = 'popular', sortOrder = '
     fetchRices();
   }, [page, limit, sortBy, sortOrder, search]);
 
-  return { rices, total, totalPages, loading, error };
+  return { rices, total, totalIsExact, totalPages, loading, error };
 };
\ No newline at end of file
@@ -28,7 +28,7 @@ export default function Home() {
   const page = parseInt(searchParams.get('page') || '1', 10);
 
   const limit = 16;
-  const { rices, total, totalPages, loading, error } = useRices(page, limit, sortBy, sortOrder, query);
+  const { rices, total, totalIsExact, totalPages, loading, error } = useRices(page, limit, sortBy, sortOrder, query);
 
   const handlePageChange = (newPage: number) => {
     if (newPage >= 1 && newPage <= totalPages) {
@@ -56,7 +56,7 @@ export default function Home() {
           </TypographyH2>
           <TypographyMuted>
             {query
-              ? `Found ${total} result${total !== 1 ? 's' : ''} matching your criteria.`
+              ? `Found ${totalIsExact ? total : `${total.toLocaleString()}+`} result${total !== 1 ? 's' : ''} matching your criteria.`
               : "Don't browse for too long or you'll end up rebuilding everything."
             }
           </TypographyMuted>
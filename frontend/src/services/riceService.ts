@@ -1,5 +1,5 @@
 import { api } from './api';
-import type { Rice, RiceCard, RiceCreate, PaginatedResponse } from '../types';
+import type { Rice, RiceCard, RiceCardBatch, RiceCreate, PaginatedResponse } from '../types';
 
 export const riceService = {
   // Get all rices for homepage cards (minimal data)
@@ -22,6 +22,14 @@ export const riceService = {
     return response.data;
   },
 
+  // Get cards for several rices in one request (does not count views)
+  getRiceCards: async (ids: number[]) => {
+    const response = await api.get<RiceCardBatch>('/rices/batch', {
+      params: { ids: ids.join(',') }
+    });
+    return response.data;
+  },
+
   // Create new rice
   createRice: async (data: RiceCreate) => {
     const response = await api.post<Rice>('/rices/', data);
@@ -37,6 +37,14 @@ export const themeService = {
     return response.data;
   },
 
+  // Apply a new theme order in one request
+  reorderThemes: async (riceId: number, themeOrder: { theme_id: number; display_order: number }[]) => {
+    const response = await api.post<Theme[]>(`/themes/rice/${riceId}/reorder`, {
+      theme_order: themeOrder
+    });
+    return response.data;
+  },
+
   // Delete theme
   deleteTheme: async (themeId: number) => {
     await api.delete(`/themes/${themeId}`);
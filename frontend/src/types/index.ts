@@ -124,9 +124,17 @@ export interface UpdateReviewRequest {
 export interface PaginatedResponse<T> {
   items: T[];
   total: number;
-  page: number;
+  total_is_exact?: boolean;
+  page: number | null;
   limit: number;
   total_pages: number;
+  next_cursor?: string | null;
+  prev_cursor?: string | null;
+}
+
+export interface RiceCardBatch {
+  items: RiceCard[];
+  missing: number[];
 }
 
 export interface ThemeCreate {